@@ -3,15 +3,31 @@ from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
 import json
 import os
-import subprocess
 import logging
-import tempfile
-import shutil
-import fitz  # PyMuPDF
-import sqlite3
+import uuid
+import queue
+from datetime import datetime
 from email_utils import send_email
-from database import add_config, get_config, add_user, get_users, add_audit_question, get_audit_questions, delete_audit_question, schedule_audit, get_audit_schedules
-from config import HEADER_IMAGE_PATH, ICON_PATH, WINDOW_BG_COLOR, BUTTON_FONT, LABEL_FONT, CONFIG_DB_PATH
+from media_launcher import MediaLauncher
+from pdf_viewer import DocumentCache, PDFViewer
+from maintenance import MaintenanceScheduler
+from audit_uploader import AuditUploader
+from report_export import BatchExporter, load_audits
+from dialogs import DialogManager
+from scheduler import AuditScheduler, RECURRENCES
+from notifier import send_audit_notification
+from revision_store import RevisionStore
+from watchdog import StallWatchdog
+from submission_journal import SubmissionJournal
+from database import add_config, get_config, add_user, get_users, add_audit_question, get_audit_questions, delete_audit_question, schedule_audit, normalize_schedule_time, get_audit_schedules_page
+from config import HEADER_IMAGE_PATH, ICON_PATH, WINDOW_BG_COLOR, BUTTON_FONT, LABEL_FONT, CONFIG_DB_PATH, NOTIFICATIONS_PAGE_SIZE
+from config import VIDEO_PLAYER_COMMAND, VIDEO_PLAYER_REUSE_COMMAND, MAX_VIDEO_PLAYERS, VIDEO_LAUNCH_DEBOUNCE_SECONDS, MEDIA_REAP_INTERVAL_MS
+from config import PDF_CACHE_MAX_DOCUMENTS, PDF_CACHE_MAX_BYTES
+from config import COLLECTOR_URL, STATION_ID, UPLOAD_BATCH_ROWS, UPLOAD_INTERVAL_SECONDS, UPLOAD_MAX_BACKOFF_SECONDS
+from config import SMTP_SERVER, SMTP_PORT, SMTP_SENDER, SMTP_LOGIN, SMTP_PASSWORD, ERROR_REPORT_RECIPIENT
+from config import REMINDER_LEAD_MINUTES, REMINDER_WINDOW_HOURS, REMINDER_BATCH_SIZE, REMINDER_REFRESH_MS, EMAIL_REMINDERS
+from config import STALL_HEARTBEAT_MS, STALL_THRESHOLD_SECONDS
+from config import JOURNAL_PATH, JOURNAL_BATCH_SIZE, JOURNAL_RETRY_INTERVAL_SECONDS, JOURNAL_MAX_BACKOFF_SECONDS, JOURNAL_BUSY_TIMEOUT_SECONDS
 
 class FileOpenerApp:
     def __init__(self, root):
@@ -22,10 +38,15 @@ class FileOpenerApp:
             self.root.iconbitmap(ICON_PATH)
             self.root.configure(background=WINDOW_BG_COLOR)
             
-            self.keyboard_window = None
+            self.dialogs = DialogManager(self)
             self.changing_path = False
             self.audit_mode = False
             self.current_auditor = ""
+            self.current_document = None
+            self.media_launcher = MediaLauncher(VIDEO_PLAYER_COMMAND, VIDEO_PLAYER_REUSE_COMMAND, MAX_VIDEO_PLAYERS, VIDEO_LAUNCH_DEBOUNCE_SECONDS)
+            self.document_cache = DocumentCache(PDF_CACHE_MAX_DOCUMENTS, PDF_CACHE_MAX_BYTES)
+            self.pdf_viewer = PDFViewer(self.root)
+            self.revision_store = RevisionStore()
             
             self.screen_width = self.root.winfo_screenwidth()
             self.screen_height = self.root.winfo_screenheight()
@@ -42,6 +63,24 @@ class FileOpenerApp:
             self.create_menu()
             self.create_header()
             self.create_notebook()
+            self.root.after(MEDIA_REAP_INTERVAL_MS, self.reap_media_players)
+            self.maintenance = MaintenanceScheduler(self.root)
+            self.root.after_idle(self.dialogs.build)
+            self.reminder_window = None
+            self.audit_scheduler = AuditScheduler(self.root, self.show_audit_reminders, REMINDER_LEAD_MINUTES * 60,
+                                                  REMINDER_WINDOW_HOURS * 3600, REMINDER_BATCH_SIZE, REMINDER_REFRESH_MS)
+            self.root.after_idle(self.audit_scheduler.start)
+            self.audit_uploader = None
+            if COLLECTOR_URL:
+                self.audit_uploader = AuditUploader(COLLECTOR_URL, STATION_ID, UPLOAD_BATCH_ROWS, UPLOAD_INTERVAL_SECONDS, UPLOAD_MAX_BACKOFF_SECONDS)
+                self.audit_uploader.start()
+            self.submission_journal = SubmissionJournal(JOURNAL_PATH, CONFIG_DB_PATH, JOURNAL_BATCH_SIZE, JOURNAL_RETRY_INTERVAL_SECONDS,
+                                                        JOURNAL_MAX_BACKOFF_SECONDS, JOURNAL_BUSY_TIMEOUT_SECONDS,
+                                                        self.audit_uploader.notify if self.audit_uploader else None)
+            self.submission_journal.start()
+            # Started once the window is up so the synchronous startup build is not logged as a stall
+            self.watchdog = StallWatchdog(self.root, STALL_HEARTBEAT_MS, STALL_THRESHOLD_SECONDS)
+            self.root.after_idle(self.watchdog.start)
         except Exception as e:
             logging.critical(f"Initialization failed: {e}")
             self.send_error_report(str(e))
@@ -93,6 +132,7 @@ class FileOpenerApp:
             settings_menu.add_command(label="Manage Questions", command=self.create_question_manager)
             settings_menu.add_command(label="Schedule Audit", command=self.create_schedule_audit_ui)
             settings_menu.add_command(label="View Notifications", command=self.create_view_notifications_ui)
+            settings_menu.add_command(label="Export Audit Reports", command=self.create_export_reports_ui)
             settings_menu.add_separator()
             settings_menu.add_command(label="Exit", command=self.root.quit)
         except Exception as e:
@@ -102,29 +142,7 @@ class FileOpenerApp:
     def authenticate_user(self):
         try:
             logging.info("Authenticating user for configuration")
-            self.auth_window = tk.Toplevel(self.root)
-            self.auth_window.title("User Authentication")
-            self.auth_window.iconbitmap(ICON_PATH)
-            self.auth_window.geometry(f"{int(400 * self.scale_factor_width)}x{int(300 * self.scale_factor_height)}")
-            self.auth_window.attributes("-topmost", True)
-
-            container = ttk.Frame(self.auth_window)
-            container.pack(expand=True, fill='both', padx=10, pady=10)
-
-            emp_num_label = ttk.Label(container, text="Employee Number:", font=self.label_font)
-            emp_num_label.pack(pady=10)
-            self.emp_num_entry = ttk.Entry(container, font=self.button_font)
-            self.emp_num_entry.pack(pady=10)
-            self.emp_num_entry.bind("<FocusIn>", lambda event: self.show_keypad(self.emp_num_entry))
-
-            pin_label = ttk.Label(container, text="Pin:", font=self.label_font)
-            pin_label.pack(pady=10)
-            self.pin_entry = ttk.Entry(container, show='*', font=self.button_font)
-            self.pin_entry.pack(pady=10)
-            self.pin_entry.bind("<FocusIn>", lambda event: self.show_keypad(self.pin_entry))
-
-            login_button = ttk.Button(container, text="Login", command=self.check_credentials, style='Custom.TButton')
-            login_button.pack(pady=0)
+            self.dialogs.open_login('config')
         except Exception as e:
             logging.error(f"Failed to authenticate user: {e}")
             self.send_error_report(str(e))
@@ -133,112 +151,20 @@ class FileOpenerApp:
     def authenticate_audit_user(self):
         try:
             logging.info("Authenticating user for audit mode")
-            self.auth_window = tk.Toplevel(self.root)
-            self.auth_window.title("User Authentication")
-            self.auth_window.iconbitmap(ICON_PATH)
-            self.auth_window.geometry(f"{int(400 * self.scale_factor_width)}x{int(300 * self.scale_factor_height)}")
-            self.auth_window.attributes("-topmost", True)
-
-            container = ttk.Frame(self.auth_window)
-            container.pack(expand=True, fill='both', padx=10, pady=10)
-
-            emp_num_label = ttk.Label(container, text="Employee Number:", font=self.label_font)
-            emp_num_label.pack(pady=10)
-            self.emp_num_entry = ttk.Entry(container, font=self.button_font)
-            self.emp_num_entry.pack(pady=10)
-            self.emp_num_entry.bind("<FocusIn>", lambda event: self.show_keypad(self.emp_num_entry))
-
-            pin_label = ttk.Label(container, text="Pin:", font=self.label_font)
-            pin_label.pack(pady=10)
-            self.pin_entry = ttk.Entry(container, show='*', font=self.button_font)
-            self.pin_entry.pack(pady=10)
-            self.pin_entry.bind("<FocusIn>", lambda event: self.show_keypad(self.pin_entry))
-
-            login_button = ttk.Button(container, text="Login", command=self.check_audit_credentials, style='Custom.TButton')
-            login_button.pack(pady=0)
+            self.dialogs.open_login('audit')
         except Exception as e:
             logging.error(f"Failed to authenticate audit user: {e}")
             self.send_error_report(str(e))
             messagebox.showerror("Error", f"Failed to authenticate audit user: {e}")
 
-    def show_keypad(self, entry):
-        try:
-            logging.info("Showing keypad")
-            if self.keyboard_window and self.keyboard_window.winfo_exists():
-                self.keyboard_window.lift()
-                self.keyboard_window.focus_force()
-                return
-
-            self.keyboard_window = tk.Toplevel(self.root)
-            self.keyboard_window.title("On-Screen Keypad")
-            self.keyboard_window.iconbitmap(ICON_PATH)
-            self.keyboard_window.geometry(f"{int(300 * self.scale_factor_width)}x{int(400 * self.scale_factor_height)}")
-            self.keyboard_window.protocol("WM_DELETE_WINDOW", self.hide_keyboard)
-            self.keyboard_window.attributes("-topmost", True)
-
-            keypad_frame = ttk.Frame(self.keyboard_window)
-            keypad_frame.pack(expand=True, fill='both', padx=10, pady=10)
-
-            buttons = [
-                '1', '2', '3', 
-                '4', '5', '6', 
-                '7', '8', '9', 
-                '0', 'Backspace', 'Enter'
-            ]
-            row_val = 0
-            col_val = 0
-
-            for button in buttons:
-                command = lambda b=button: self.on_key_press(b, entry)
-                ttk.Button(keypad_frame, text=button, command=command, width=10).grid(row=row_val, column=col_val, sticky='nsew', padx=5, pady=5)
-                col_val += 1
-                if col_val > 2:
-                    col_val = 0
-                    row_val += 1
-
-            for i in range(3):
-                keypad_frame.grid_columnconfigure(i, weight=1)
-            for i in range(4):
-                keypad_frame.grid_rowconfigure(i, weight=1)
-        except Exception as e:
-            logging.error(f"Failed to show keypad: {e}")
-            self.send_error_report(str(e))
-            messagebox.showerror("Error", f"Failed to show keypad: {e}")
-
-    def hide_keyboard(self):
-        try:
-            logging.info("Hiding keypad")
-            if self.keyboard_window:
-                self.keyboard_window.destroy()
-        except Exception as e:
-            logging.error(f"Failed to hide keypad: {e}")
-            self.send_error_report(str(e))
-            messagebox.showerror("Error", f"Failed to hide keypad: {e}")
-
-    def on_key_press(self, key, entry):
-        try:
-            logging.info(f"Key pressed: {key}")
-            if key == "Backspace":
-                current_text = entry.get()
-                entry.delete(len(current_text)-1, tk.END)
-            elif key == "Enter":
-                self.hide_keyboard()
-                entry.tk_focusNext().focus()
-            else:
-                entry.insert(tk.END, key)
-        except Exception as e:
-            logging.error(f"Failed to handle key press: {e}")
-            self.send_error_report(str(e))
-            messagebox.showerror("Error", f"Failed to handle key press: {e}")
-
     def check_credentials(self):
         try:
-            emp_num = self.emp_num_entry.get()
-            pin = self.pin_entry.get()
+            emp_num = self.dialogs.login.emp_num_entry.get()
+            pin = self.dialogs.login.pin_entry.get()
             logging.info(f"Checking credentials for emp_num: {emp_num}")
             if self.verify_credentials(emp_num, pin):
                 self.current_auditor = emp_num
-                self.auth_window.destroy()
+                self.dialogs.login.hide()
                 self.enable_path_change()
             else:
                 messagebox.showerror("Login Failed", "Invalid credentials!")
@@ -249,12 +175,12 @@ class FileOpenerApp:
 
     def check_audit_credentials(self):
         try:
-            emp_num = self.emp_num_entry.get()
-            pin = self.pin_entry.get()
+            emp_num = self.dialogs.login.emp_num_entry.get()
+            pin = self.dialogs.login.pin_entry.get()
             logging.info(f"Checking audit credentials for emp_num: {emp_num}")
             if self.verify_credentials(emp_num, pin):
                 self.current_auditor = emp_num
-                self.auth_window.destroy()
+                self.dialogs.login.hide()
                 self.audit_mode = True
                 messagebox.showinfo("Audit Mode", "Audit mode activated.")
             else:
@@ -292,6 +218,9 @@ class FileOpenerApp:
             if self.changing_path:
                 new_path = filedialog.askopenfilename(title=f"Select new file for {button_info['text']}")
                 if new_path:
+                    old_path = button_info["path"]
+                    if old_path.endswith('.pdf') and new_path.endswith('.pdf'):
+                        self.record_revision(old_path, new_path)
                     button_info["path"] = new_path
                     self.save_config()
                     button.config(command=lambda: self.open_file(button_info["path"], 'pdf' if new_path.endswith('.pdf') else 'video'))
@@ -385,12 +314,10 @@ class FileOpenerApp:
             logging.info(f"Opening PDF: {file_path}")
             if self.audit_mode:
                 try:
-                    temp_dir = tempfile.mkdtemp()
-                    temp_file_path = os.path.join(temp_dir, os.path.basename(file_path))
-                    shutil.copyfile(file_path, temp_file_path)
-                    
-                    doc = fitz.open(temp_file_path)
+                    doc = self.document_cache.get(file_path)
+                    self.current_document = file_path
                     self.display_pdf(doc)
+                    self.show_revision_changes(file_path, doc)
                 except PermissionError:
                     messagebox.showerror("Error", "Access is denied. Permission error.")
                     logging.error("Access is denied. Permission error.")
@@ -414,61 +341,51 @@ class FileOpenerApp:
     def display_pdf(self, doc):
         try:
             logging.info("Displaying PDF")
-            pdf_window = tk.Toplevel(self.root)
-            pdf_window.title("PDF Viewer")
-            pdf_window.iconbitmap(ICON_PATH)
-            pdf_window.state('zoomed')
-            pdf_window.attributes("-topmost", True)
-
-            main_frame = ttk.Frame(pdf_window)
-            main_frame.grid(row=0, column=0, sticky="nsew")
-
-            pdf_frame = ttk.Frame(main_frame)
-            pdf_frame.grid(row=0, column=0, sticky="nsew")
-
-            audit_frame = ttk.Frame(main_frame)
-            audit_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
-
-            canvas = tk.Canvas(pdf_frame, bg='white')
-            scrollbar = ttk.Scrollbar(pdf_frame, orient=tk.VERTICAL, command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas)
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(
-                    scrollregion=canvas.bbox("all")
-                )
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
-
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                photo = ImageTk.PhotoImage(img)
-
-                label = ttk.Label(scrollable_frame, image=photo, background='white')
-                label.image = photo
-                label.pack(pady=10, padx=10)
-
-            if self.audit_mode:
-                self.create_audit_form(audit_frame)
-
-            pdf_window.grid_columnconfigure(0, weight=1)
-            pdf_window.grid_rowconfigure(0, weight=1)
-            main_frame.grid_columnconfigure(0, weight=3)
-            main_frame.grid_columnconfigure(1, weight=1)
-            main_frame.grid_rowconfigure(0, weight=1)
+            self.pdf_viewer.show(doc, self.create_audit_form if self.audit_mode else None)
         except Exception as e:
             logging.error(f"Failed to display PDF: {e}")
             self.send_error_report(str(e))
             messagebox.showerror("Error", f"Failed to display PDF: {e}")
 
+    def record_revision(self, old_path, new_path):
+        # The new file is rendered the first time it is opened for an audit
+        def done(future):
+            if future.exception() is not None:
+                logging.error(f"Failed to record document revision: {future.exception()}")
+        try:
+            self.revision_store.submit_replacement(old_path, new_path).add_done_callback(done)
+        except Exception as e:
+            logging.error(f"Failed to record document revision: {e}")
+
+    def show_revision_changes(self, file_path, doc):
+        # The comparison renders every page when the file changed. It runs in
+        # the revision worker process from the cache's private copy and the
+        # highlights are drawn when it finishes.
+        try:
+            future = self.revision_store.submit_update(file_path, self.document_cache.local_path(file_path))
+        except Exception as e:
+            logging.error(f"Failed to compare document revisions: {e}")
+            return
+
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+                return
+            try:
+                diff = future.result()
+            except Exception as e:
+                logging.error(f"Failed to compare document revisions: {e}")
+                return
+            if not diff or self.pdf_viewer.doc is not doc:
+                return
+            changed = diff['changed_pages']
+            self.pdf_viewer.set_highlights(changed)
+            if changed or diff['added_pages'] or diff['removed_pages']:
+                self.pdf_viewer.window.title(f"PDF Viewer - {len(changed)} changed, {len(diff['added_pages'])} added, "
+                                             f"{len(diff['removed_pages'])} removed pages since {diff['computed_at']}")
+
+        self.root.after(100, poll)
+
     def create_audit_form(self, audit_frame):
         try:
             logging.info("Creating dynamic audit form")
@@ -506,16 +423,14 @@ class FileOpenerApp:
     def submit_audit(self, auditor_name, team_member, responses, comments):
         try:
             logging.info(f"Submitting audit: Auditor={auditor_name}, Team Member={team_member}")
-            conn = sqlite3.connect(CONFIG_DB_PATH)
-            cursor = conn.cursor()
-
-            for question_id, response_combobox in responses:
-                response = response_combobox.get()
-                cursor.execute('INSERT INTO audit_results (auditor, team_member, question_id, response, comments) VALUES (?, ?, ?, ?, ?)', 
-                               (auditor_name, team_member, question_id, response, comments))
-
-            conn.commit()
-            conn.close()
+            submission_id = uuid.uuid4().hex
+            submitted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [{'auditor': auditor_name, 'team_member': team_member, 'question_id': question_id, 'response': response_combobox.get(),
+                     'comments': comments, 'submitted_at': submitted_at, 'document_path': self.current_document,
+                     'station': STATION_ID}
+                    for question_id, response_combobox in responses]
+            # Written to the shared database by the journal's background writer
+            self.submission_journal.append(submission_id, rows)
             
             messagebox.showinfo("Audit Submitted", "Audit has been submitted successfully.")
             logging.info(f"Audit submitted: Auditor={auditor_name}, Team Member={team_member}")
@@ -529,7 +444,7 @@ class FileOpenerApp:
         try:
             logging.info(f"Opening video file: {file_path}")
             try:
-                subprocess.Popen([file_path], shell=True)
+                self.media_launcher.open(file_path)
             except FileNotFoundError:
                 messagebox.showerror("Error", f"File not found: {file_path}")
                 logging.error(f"File not found: {file_path}")
@@ -541,6 +456,14 @@ class FileOpenerApp:
             self.send_error_report(str(e))
             messagebox.showerror("Error", f"Failed to open video: {e}")
 
+    def reap_media_players(self):
+        try:
+            self.media_launcher.reap()
+        except Exception as e:
+            logging.error(f"Failed to reap media players: {e}")
+        finally:
+            self.root.after(MEDIA_REAP_INTERVAL_MS, self.reap_media_players)
+
     def create_question_manager(self):
         try:
             logging.info("Creating question manager")
@@ -637,21 +560,36 @@ class FileOpenerApp:
             audit_time_entry = ttk.Entry(schedule_window, font=self.button_font)
             audit_time_entry.pack(pady=5)
 
+            ttk.Label(schedule_window, text="Repeat:", font=self.label_font).pack(pady=10)
+            recurrence_combobox = ttk.Combobox(schedule_window, values=["never", *RECURRENCES], state="readonly", font=self.button_font)
+            recurrence_combobox.set("never")
+            recurrence_combobox.pack(pady=5)
+
             ttk.Label(schedule_window, text="Description:", font=self.label_font).pack(pady=10)
             description_entry = tk.Text(schedule_window, font=self.button_font, height=4, width=40)
             description_entry.pack(pady=5)
 
             schedule_button = ttk.Button(schedule_window, text="Schedule Audit", style='Custom.TButton',
-                                         command=lambda: self.schedule_audit(auditor_id_entry.get(), audit_date_entry.get(), audit_time_entry.get(), description_entry.get("1.0", tk.END)))
+                                         command=lambda: self.schedule_audit(auditor_id_entry.get(), audit_date_entry.get(), audit_time_entry.get(), description_entry.get("1.0", tk.END), recurrence_combobox.get()))
             schedule_button.pack(pady=10)
         except Exception as e:
             logging.error(f"Failed to create schedule audit UI: {e}")
             self.send_error_report(str(e))
             messagebox.showerror("Error", f"Failed to create schedule audit UI: {e}")
 
-    def schedule_audit(self, auditor_id, audit_date, audit_time, description):
+    def schedule_audit(self, auditor_id, audit_date, audit_time, description, recurrence="never"):
         try:
-            schedule_audit(int(auditor_id), audit_date, audit_time, description.strip())
+            normalized = normalize_schedule_time(audit_date, audit_time)
+            if normalized is None:
+                messagebox.showerror("Error", "Enter the date as YYYY-MM-DD and the time as HH:MM.")
+                return
+            audit_date, audit_time = normalized
+            recurrence = recurrence if recurrence in RECURRENCES else None
+            schedule_id = schedule_audit(int(auditor_id), audit_date, audit_time, description.strip(), recurrence)
+            if schedule_id is None:
+                raise RuntimeError("The schedule could not be saved")
+            self.audit_scheduler.add(schedule_id)
+            send_audit_notification(int(auditor_id), audit_date, audit_time, description.strip())
             messagebox.showinfo("Success", "Audit scheduled successfully.")
         except Exception as e:
             logging.error(f"Failed to schedule audit: {e}")
@@ -664,26 +602,206 @@ class FileOpenerApp:
             notification_window = tk.Toplevel(self.root)
             notification_window.title("View Notifications")
             notification_window.iconbitmap(ICON_PATH)
-            notification_window.geometry(f"{int(500 * self.scale_factor_width)}x{int(400 * self.scale_factor_height)}")
+            notification_window.geometry(f"{int(900 * self.scale_factor_width)}x{int(600 * self.scale_factor_height)}")
+
+            filter_frame = ttk.Frame(notification_window)
+            filter_frame.pack(fill='x', padx=10, pady=10)
 
-            notifications = get_audit_schedules()
+            upcoming_var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(filter_frame, text="Upcoming only", variable=upcoming_var).pack(side='left', padx=5)
 
-            for schedule in notifications:
-                ttk.Label(notification_window, text=f"Audit ID: {schedule[0]}\nAuditor ID: {schedule[1]}\nDate: {schedule[2]}\nTime: {schedule[3]}\nDescription: {schedule[4]}",
-                          font=self.button_font, justify=tk.LEFT, wraplength=int(400 * self.scale_factor_width)).pack(pady=5, anchor='w')
+            ttk.Label(filter_frame, text="Auditor:", font=self.button_font).pack(side='left', padx=5)
+            auditor_choices = {"All": None}
+            for user in self.users:
+                auditor_choices[f"{user[1]} ({user[0]})"] = user[0]
+            auditor_combobox = ttk.Combobox(filter_frame, values=list(auditor_choices), state="readonly", font=self.button_font, width=15)
+            auditor_combobox.set("All")
+            auditor_combobox.pack(side='left', padx=5)
+
+            ttk.Label(filter_frame, text="From:", font=self.button_font).pack(side='left', padx=5)
+            start_date_entry = ttk.Entry(filter_frame, font=self.button_font, width=11)
+            start_date_entry.pack(side='left', padx=5)
+            ttk.Label(filter_frame, text="To:", font=self.button_font).pack(side='left', padx=5)
+            end_date_entry = ttk.Entry(filter_frame, font=self.button_font, width=11)
+            end_date_entry.pack(side='left', padx=5)
+
+            tree_frame = ttk.Frame(notification_window)
+            tree_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+            columns = ("id", "date", "time", "auditor", "email", "description")
+            tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
+            for column, heading, width in zip(columns, ("Audit ID", "Date", "Time", "Auditor", "Email", "Description"), (70, 100, 70, 110, 180, 300)):
+                tree.heading(column, text=heading)
+                tree.column(column, width=int(width * self.scale_factor_width), stretch=(column == "description"))
+
+            scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+
+            state = {"filters": {}, "last_row": None, "exhausted": False}
+
+            def load_page():
+                if state["exhausted"]:
+                    return
+                rows = get_audit_schedules_page(after=state["last_row"], limit=NOTIFICATIONS_PAGE_SIZE, **state["filters"])
+                for row in rows:
+                    schedule_id, audit_date, audit_time, auditor_id, employee_number, email, description = row
+                    tree.insert('', tk.END, values=(schedule_id, audit_date, audit_time, employee_number or auditor_id, email or "", (description or "").replace("\n", " ")))
+                if rows:
+                    state["last_row"] = rows[-1]
+                if len(rows) < NOTIFICATIONS_PAGE_SIZE:
+                    state["exhausted"] = True
+
+            def on_scroll(first, last):
+                scrollbar.set(first, last)
+                if float(last) >= 0.9:
+                    load_page()
+
+            def apply_filters():
+                state["filters"] = {
+                    "auditor_id": auditor_choices.get(auditor_combobox.get()),
+                    "start_date": start_date_entry.get().strip() or None,
+                    "end_date": end_date_entry.get().strip() or None,
+                    "upcoming_only": upcoming_var.get(),
+                }
+                state["last_row"] = None
+                state["exhausted"] = False
+                tree.delete(*tree.get_children())
+                load_page()
+
+            tree.configure(yscrollcommand=on_scroll)
+            ttk.Button(filter_frame, text="Apply", style='Custom.TButton', command=apply_filters).pack(side='left', padx=5)
+            apply_filters()
         except Exception as e:
             logging.error(f"Failed to create view notifications UI: {e}")
             self.send_error_report(str(e))
             messagebox.showerror("Error", f"Failed to create view notifications UI: {e}")
 
+    def create_export_reports_ui(self):
+        try:
+            logging.info("Creating export reports UI")
+            export_window = tk.Toplevel(self.root)
+            export_window.title("Export Audit Reports")
+            export_window.iconbitmap(ICON_PATH)
+            export_window.geometry(f"{int(500 * self.scale_factor_width)}x{int(450 * self.scale_factor_height)}")
+
+            ttk.Label(export_window, text="From (YYYY-MM-DD):", font=self.label_font).pack(pady=5)
+            start_date_entry = ttk.Entry(export_window, font=self.button_font)
+            start_date_entry.pack(pady=5)
+            ttk.Label(export_window, text="To (YYYY-MM-DD):", font=self.label_font).pack(pady=5)
+            end_date_entry = ttk.Entry(export_window, font=self.button_font)
+            end_date_entry.pack(pady=5)
+            ttk.Label(export_window, text="Auditor (optional):", font=self.label_font).pack(pady=5)
+            auditor_entry = ttk.Entry(export_window, font=self.button_font)
+            auditor_entry.pack(pady=5)
+
+            progress_bar = ttk.Progressbar(export_window, mode='determinate', length=int(400 * self.scale_factor_width))
+            progress_bar.pack(pady=10)
+            status_label = ttk.Label(export_window, text="", font=self.button_font)
+            status_label.pack(pady=5)
+
+            exporter = BatchExporter()
+            updates = queue.Queue()
+
+            def poll():
+                if not export_window.winfo_exists():
+                    exporter.cancel()
+                    return
+                finished = None
+                while not updates.empty():
+                    kind, value = updates.get_nowait()
+                    if kind == 'progress':
+                        done_count, total = value
+                        progress_bar.configure(maximum=total, value=done_count)
+                        status_label.configure(text=f"Exported {done_count} of {total}")
+                    else:
+                        finished = value
+                if finished is None:
+                    export_window.after(100, poll)
+                    return
+                results, error = finished
+                export_button.configure(state='normal')
+                failed = [result for result in results if result[1] is None]
+                if error is not None:
+                    messagebox.showerror("Error", f"Failed to export audit reports: {error}")
+                elif not results:
+                    status_label.configure(text="")
+                    messagebox.showinfo("Export Audit Reports", "No audits found for that selection.")
+                elif failed:
+                    messagebox.showerror("Export Incomplete", f"{len(failed)} of {len(results)} audits could not be exported. First error: {failed[0][2]}")
+                else:
+                    messagebox.showinfo("Export Complete", f"Exported {len(results)} audits.")
+
+            def start_export():
+                try:
+                    start_date = start_date_entry.get().strip()
+                    end_date = end_date_entry.get().strip()
+                    try:
+                        if datetime.strptime(start_date, '%Y-%m-%d') > datetime.strptime(end_date, '%Y-%m-%d'):
+                            messagebox.showerror("Error", "The start date must not be after the end date.")
+                            return
+                    except ValueError:
+                        messagebox.showerror("Error", "Enter both dates as YYYY-MM-DD.")
+                        return
+                    auditor = auditor_entry.get().strip() or None
+                    output_dir = filedialog.askdirectory(title="Select export folder")
+                    if not output_dir:
+                        return
+                    export_button.configure(state='disabled')
+                    progress_bar.configure(value=0)
+                    status_label.configure(text="Loading audits...")
+                    # Reading the archives can take a while, so audits are loaded on the export thread
+                    exporter.start(lambda: load_audits(start_date, end_date, auditor), output_dir,
+                                   lambda done_count, total, results: updates.put(('progress', (done_count, total))),
+                                   lambda results, error: updates.put(('done', (results, error))))
+                    export_window.after(100, poll)
+                except Exception as e:
+                    export_button.configure(state='normal')
+                    logging.error(f"Failed to start audit report export: {e}")
+                    self.send_error_report(str(e))
+                    messagebox.showerror("Error", f"Failed to start audit report export: {e}")
+
+            export_button = ttk.Button(export_window, text="Export", style='Custom.TButton', command=start_export)
+            export_button.pack(pady=10)
+        except Exception as e:
+            logging.error(f"Failed to create export reports UI: {e}")
+            self.send_error_report(str(e))
+            messagebox.showerror("Error", f"Failed to create export reports UI: {e}")
+
+    def show_audit_reminders(self, reminders):
+        try:
+            logging.info(f"Showing {len(reminders)} audit reminders")
+            if self.reminder_window is None or not self.reminder_window.winfo_exists():
+                self.reminder_window = tk.Toplevel(self.root)
+                self.reminder_window.title("Audit Reminders")
+                self.reminder_window.iconbitmap(ICON_PATH)
+                self.reminder_window.geometry(f"{int(600 * self.scale_factor_width)}x{int(300 * self.scale_factor_height)}")
+                self.reminder_window.attributes("-topmost", True)
+                self.reminder_window.protocol("WM_DELETE_WINDOW", self.reminder_window.withdraw)
+                self.reminder_list = tk.Listbox(self.reminder_window, font=self.button_font)
+                self.reminder_list.pack(expand=True, fill='both', padx=10, pady=10)
+
+            for row, occurrence, email_owner in reminders:
+                schedule_id, auditor_id, _, _, description, _, recurrence, _ = row
+                when = datetime.fromtimestamp(occurrence).strftime('%Y-%m-%d %H:%M')
+                self.reminder_list.insert(0, f"{when}  Auditor {auditor_id}: {(description or '').strip()}{'  (' + recurrence + ')' if recurrence else ''}")
+                # Only the station that claimed the occurrence emails the auditor
+                if EMAIL_REMINDERS and email_owner:
+                    date_text, time_text = when.split(' ')
+                    send_audit_notification(auditor_id, date_text, time_text, description or '', subject="Audit Reminder")
+            self.reminder_list.delete(200, tk.END)
+            self.reminder_window.deiconify()
+            self.reminder_window.lift()
+        except Exception as e:
+            logging.error(f"Failed to show audit reminders: {e}")
+            self.send_error_report(str(e))
+
     def send_error_report(self, error_message):
         try:
-            sender_email = "your_email@example.com"
-            receiver_email = "admin@example.com"
             subject = "Error Report"
             body = f"An error occurred:\n\n{error_message}"
 
-            send_email(sender_email, receiver_email, subject, body, 'smtp.example.com', 587, sender_email, "your_password")
+            send_email(SMTP_SENDER, ERROR_REPORT_RECIPIENT, subject, body, SMTP_SERVER, SMTP_PORT, SMTP_LOGIN, SMTP_PASSWORD)
             logging.info("Error report sent successfully.")
         except Exception as e:
             logging.error(f"Failed to send error report: {e}")
@@ -0,0 +1,112 @@
+import gzip
+import json
+import sqlite3
+import threading
+import logging
+import urllib.request
+from database import add_config, get_config
+from config import CONFIG_DB_PATH
+
+class AuditUploader(threading.Thread):
+    # Pushes this station's audit_results to the plant collector in the
+    # background. Stations may share config.db, so each uploads only rows
+    # tagged with its own station and keeps its own watermark on
+    # audit_results.id in the config table. Rows are re-sent after a failure
+    # or restart until the collector accepts them; the collector ignores
+    # duplicates by submission_id. Rows written before stations were
+    # recorded (station NULL) or before submission_id existed cannot be
+    # attributed or de-duplicated and are never uploaded.
+    def __init__(self, collector_url, station_id, batch_rows=1000, interval=30, max_backoff=600, timeout=10):
+        super().__init__(name='audit-uploader', daemon=True)
+        self.collector_url = collector_url.rstrip('/')
+        self.station_id = station_id
+        self.batch_rows = batch_rows
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def run(self):
+        self.log_unattributed_rows()
+        delay = 0
+        while not self.stop_event.is_set():
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+            if self.stop_event.is_set():
+                break
+            try:
+                sent_rows = self.upload_pending()
+                delay = 0 if sent_rows >= self.batch_rows else self.interval
+            except Exception as e:
+                delay = min(max(delay * 2, self.interval), self.max_backoff)
+                logging.error(f"Failed to upload audits, retrying in {delay}s: {e}")
+
+    def notify(self):
+        # Called after a submission so it goes out without waiting for the interval
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def log_unattributed_rows(self):
+        try:
+            conn = sqlite3.connect(CONFIG_DB_PATH)
+            try:
+                count = conn.execute('SELECT COUNT(*) FROM audit_results WHERE station IS NULL OR submission_id IS NULL').fetchone()[0]
+            finally:
+                conn.close()
+            if count:
+                logging.warning(f"{count} audit_results rows predate station/submission tracking and are not uploaded")
+        except Exception as e:
+            logging.error(f"Failed to count unattributed audit results: {e}")
+
+    def upload_pending(self):
+        watermark_key = f'collector_upload_watermark:{self.station_id}'
+        watermark = int(get_config(watermark_key) or 0)
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        try:
+            rows = conn.execute(
+                'SELECT id, submission_id, auditor, team_member, question_id, response, comments, submitted_at '
+                'FROM audit_results WHERE station = ? AND id > ? ORDER BY id LIMIT ?', (self.station_id, watermark, self.batch_rows)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return 0
+
+        submissions = {}
+        for row_id, submission_id, auditor, team_member, question_id, response, comments, submitted_at in rows:
+            if submission_id is None:
+                continue
+            submission = submissions.setdefault(submission_id, {
+                'submission_id': submission_id,
+                'station': self.station_id,
+                'auditor': auditor,
+                'team_member': team_member,
+                'submitted_at': submitted_at,
+                'comments': comments,
+                'responses': [],
+            })
+            submission['responses'].append([question_id, response])
+
+        if submissions:
+            self.post(list(submissions.values()))
+        add_config(watermark_key, str(rows[-1][0]))
+        logging.info(f"Uploaded {len(submissions)} audit submissions to collector")
+        return len(rows)
+
+    def post(self, submissions):
+        request = urllib.request.Request(
+            f"{self.collector_url}/audits",
+            data=gzip.compress(json.dumps(submissions).encode()),
+            headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+            method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Collector responded with status {response.status}")
+            result = json.loads(response.read() or b'{}')
+        # Rejected submissions are malformed and would be rejected again, so
+        # they are logged and the watermark still moves past them
+        for rejection in result.get('rejected', []):
+            logging.error(f"Collector rejected submission {rejection.get('submission_id')}: {rejection.get('error')}")
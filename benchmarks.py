@@ -0,0 +1,371 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import smtplib
+import statistics
+import sys
+import tempfile
+import time
+import types
+import uuid
+from tkinter import messagebox
+import database
+from diagnostics import percentile
+from fixtures import generate_pdfs, build_tabs, create_config_db
+from shift_simulation import SMTPStub
+
+# Micro-benchmarks for the application's hot paths, run against generated
+# fixtures in a scratch directory.
+#
+#   python benchmarks.py --output results.json
+#   python benchmarks.py --save-baseline benchmarks_baseline.json
+#   python benchmarks.py --baseline benchmarks_baseline.json --threshold 0.2
+#
+# Medians are only comparable on the machine that recorded them, so no
+# baseline is kept in the repository. Record one with --save-baseline on the
+# kiosk (or the CI machine) from a known-good build, keep it there, and
+# compare later builds against it on the same machine.
+#
+# Benchmarks registered with gated=False commit to disk and are dominated by
+# fsync latency, which varies far more than the code under test. Their
+# changes are reported but only fail the run with --gate-all.
+#
+# Each benchmark is a function that prepares its fixtures and returns the
+# callable to time. GUI benchmarks need a display (Xvfb is started when
+# missing) and are skipped with --no-gui.
+
+BENCHMARKS = []
+
+def benchmark(name, number=1, gui=False, gated=True):
+    def register(setup):
+        BENCHMARKS.append({'name': name, 'setup': setup, 'number': number, 'gui': gui, 'gated': gated})
+        return setup
+    return register
+
+class FakeCombobox:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+def app_stub(**attributes):
+    # Stands in for FileOpenerApp when calling its methods without a window
+    stub = types.SimpleNamespace(audit_uploader=None, audit_mode=True, current_document=None, send_error_report=lambda message: None)
+    stub.__dict__.update(attributes)
+    return stub
+
+def fresh_db(workdir, name, **kwargs):
+    directory = os.path.join(workdir, name)
+    os.makedirs(directory, exist_ok=True)
+    db_path, credentials = create_config_db(directory, **kwargs)
+    database.CONFIG_DB_PATH = db_path
+    return db_path, credentials
+
+# database.py helpers
+
+@benchmark('database.init_db')
+def bench_init_db(workdir):
+    fresh_db(workdir, 'init_db')
+    return database.init_db
+
+@benchmark('database.add_config', gated=False)
+def bench_add_config(workdir):
+    fresh_db(workdir, 'add_config')
+    return lambda: database.add_config('bench', 'value')
+
+@benchmark('database.get_config', number=10)
+def bench_get_config(workdir):
+    fresh_db(workdir, 'get_config', tabs=build_tabs([f"doc{i}.pdf" for i in range(200)]))
+    return lambda: database.get_config('tabs')
+
+@benchmark('database.add_user', gated=False)
+def bench_add_user(workdir):
+    fresh_db(workdir, 'add_user', users=1000)
+    counter = iter(range(10 ** 9))
+    return lambda: database.add_user(f"9{next(counter):08d}", '1234', 'bench@example.com')
+
+@benchmark('database.get_users[1000]', number=5)
+def bench_get_users(workdir):
+    fresh_db(workdir, 'get_users', users=1000)
+    return database.get_users
+
+@benchmark('database.add_audit_question', gated=False)
+def bench_add_audit_question(workdir):
+    fresh_db(workdir, 'add_audit_question')
+    return lambda: database.add_audit_question("Benchmark question")
+
+@benchmark('database.get_audit_questions', number=10)
+def bench_get_audit_questions(workdir):
+    fresh_db(workdir, 'get_audit_questions', questions=50)
+    return database.get_audit_questions
+
+@benchmark('database.delete_audit_question', gated=False)
+def bench_delete_audit_question(workdir):
+    fresh_db(workdir, 'delete_audit_question', questions=5000)
+    ids = iter(range(1, 5001))
+    return lambda: database.delete_audit_question(next(ids))
+
+@benchmark('database.schedule_audit', gated=False)
+def bench_schedule_audit(workdir):
+    fresh_db(workdir, 'schedule_audit', users=10)
+    return lambda: database.schedule_audit(1, '2030-01-01', '08:00', 'Benchmark audit')
+
+@benchmark('database.get_audit_schedules[100000]')
+def bench_get_audit_schedules(workdir):
+    fresh_db(workdir, 'get_audit_schedules', users=100, schedules=100000)
+    return database.get_audit_schedules
+
+@benchmark('database.get_audit_schedules_page[100000]', number=10)
+def bench_get_audit_schedules_page(workdir):
+    fresh_db(workdir, 'get_audit_schedules_page', users=100, schedules=100000)
+    return lambda: database.get_audit_schedules_page(upcoming_only=True)
+
+# FileOpenerApp methods
+
+def make_submit_audit_benchmark(question_count, locked=False):
+    # With locked=True another connection holds an exclusive lock on the
+    # shared database for the whole run, as a busy station or slow share would
+    def setup(workdir):
+        import sqlite3
+        from app import FileOpenerApp
+        from submission_journal import SubmissionJournal
+        name = f"submit_audit_{question_count}{'_locked' if locked else ''}"
+        db_path, _ = fresh_db(workdir, name, questions=question_count)
+        journal = SubmissionJournal(os.path.join(workdir, name, 'journal.db'), db_path)
+        if locked:
+            blocker = sqlite3.connect(db_path)
+            blocker.execute('BEGIN EXCLUSIVE')
+            journal.blocker = blocker
+        responses = [(question_id, FakeCombobox("O")) for question_id in range(1, question_count + 1)]
+        stub = app_stub(submission_journal=journal)
+        return lambda: FileOpenerApp.submit_audit(stub, '100000', 'TM1000', responses, 'Benchmark comment')
+    return setup
+
+def make_verify_credentials_benchmark(user_count):
+    def setup(workdir):
+        from app import FileOpenerApp
+        fresh_db(workdir, f'verify_credentials_{user_count}', users=user_count)
+        stub = app_stub(users=database.get_users())
+        emp_num, pin = stub.users[-1][1], stub.users[-1][2]
+        return lambda: FileOpenerApp.verify_credentials(stub, emp_num, pin)
+    return setup
+
+for question_count in (5, 25, 100):
+    # submit_audit only appends to the local journal since the journal was
+    # introduced; the names say so, so results saved from the older direct
+    # write are not compared against these
+    benchmark(f'app.submit_audit[{question_count} questions, journaled]', gated=False)(make_submit_audit_benchmark(question_count))
+benchmark('app.submit_audit[25 questions, journaled, database locked]', gated=False)(make_submit_audit_benchmark(25, locked=True))
+
+@benchmark('submission_journal.flush[50 submissions]', gated=False)
+def bench_journal_flush(workdir):
+    from submission_journal import SubmissionJournal
+    db_path, _ = fresh_db(workdir, 'journal_flush', questions=25)
+    journal = SubmissionJournal(os.path.join(workdir, 'journal_flush', 'journal.db'), db_path, batch_size=50)
+    rows = [{'auditor': '100000', 'team_member': 'TM1000', 'question_id': question_id, 'response': 'O', 'comments': '',
+             'submitted_at': '2030-01-01 08:00:00', 'document_path': None, 'station': 'BENCH'} for question_id in range(1, 26)]
+
+    def append_and_flush():
+        for _ in range(50):
+            journal.append(uuid.uuid4().hex, rows)
+        journal.flush(journal.conn)
+    return append_and_flush
+
+for user_count in (10, 1000, 10000):
+    benchmark(f'app.verify_credentials[{user_count} users]', number=max(10, 100000 // user_count))(make_verify_credentials_benchmark(user_count))
+
+def large_tabs():
+    return build_tabs([f"J:/STW/Line/Process {i}.pdf" for i in range(5000)], tabs=20, groups_per_tab=10)
+
+@benchmark('app.load_config[5000 buttons]', number=5)
+def bench_load_config(workdir):
+    from app import FileOpenerApp
+    fresh_db(workdir, 'load_config', tabs=large_tabs())
+    stub = app_stub()
+    return lambda: FileOpenerApp.load_config(stub)
+
+@benchmark('app.save_config[5000 buttons]', gated=False)
+def bench_save_config(workdir):
+    from app import FileOpenerApp
+    fresh_db(workdir, 'save_config')
+    stub = app_stub(config={"tabs": large_tabs()})
+    return lambda: FileOpenerApp.save_config(stub)
+
+@benchmark('pdf.rasterize_page')
+def bench_rasterize_page(workdir):
+    # The per-page work done when the viewer shows a document, minus Tk
+    import fitz  # PyMuPDF
+    from PIL import Image
+    directory = os.path.join(workdir, 'pdfs')
+    os.makedirs(directory, exist_ok=True)
+    doc = fitz.open(generate_pdfs(directory, 1, pages=1)[0])
+    page = doc.load_page(0)
+
+    def rasterize():
+        pix = page.get_pixmap()
+        Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    return rasterize
+
+# GUI construction
+
+def make_app(workdir, name, **kwargs):
+    import tkinter as tk
+    import app as app_module
+    from app import FileOpenerApp
+    from fixtures import generate_image
+    directory = os.path.join(workdir, name)
+    os.makedirs(directory, exist_ok=True)
+    app_module.HEADER_IMAGE_PATH = generate_image(os.path.join(directory, 'header.png'))
+    fresh_db(workdir, name, **kwargs)
+    app_module.CONFIG_DB_PATH = database.CONFIG_DB_PATH
+    root = tk.Tk()
+    return root, FileOpenerApp(root)
+
+@benchmark('gui.create_notebook[5000 buttons]', gui=True)
+def bench_create_notebook(workdir):
+    root, app = make_app(workdir, 'create_notebook', tabs=large_tabs())
+
+    def build():
+        for child in root.winfo_children():
+            if child.winfo_class() == 'TNotebook':
+                child.destroy()
+        app.create_notebook()
+        root.update()
+    return build
+
+@benchmark('gui.login_dialog_open', gui=True)
+def bench_login_dialog_open(workdir):
+    root, app = make_app(workdir, 'login_dialog_open')
+
+    def open_and_close():
+        app.authenticate_audit_user()
+        root.update()
+        app.dialogs.login.hide()
+        root.update()
+    return open_and_close
+
+@benchmark('gui.keypad_show', gui=True)
+def bench_keypad_show(workdir):
+    root, app = make_app(workdir, 'keypad_show')
+    app.dialogs.build()
+    entry = app.dialogs.login.emp_num_entry
+
+    def show_and_hide():
+        app.dialogs.keypad.show(entry)
+        root.update()
+        app.dialogs.keypad.hide()
+        root.update()
+    return show_and_hide
+
+def run_benchmark(entry, workdir, repeat, min_time):
+    func = entry['setup'](workdir)
+    func()  # warm-up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        for _ in range(entry['number']):
+            func()
+        timings.append((time.perf_counter() - call_started) / entry['number'])
+        if len(timings) >= repeat * 20:
+            break
+    timings.sort()
+    return {
+        'rounds': len(timings),
+        'min_ms': timings[0] * 1000,
+        'median_ms': statistics.median(timings) * 1000,
+        'mean_ms': statistics.fmean(timings) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'stdev_ms': statistics.pstdev(timings) * 1000,
+    }
+
+def compare(results, baseline, threshold, gated_names):
+    # Returns (regressions, ungated changes beyond the threshold)
+    regressions = []
+    ungated = []
+    for name, stats in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        ratio = stats['median_ms'] / previous['median_ms'] if previous['median_ms'] else 1.0
+        stats['baseline_median_ms'] = previous['median_ms']
+        stats['change'] = ratio - 1
+        if ratio > 1 + threshold:
+            (regressions if name in gated_names else ungated).append((name, previous['median_ms'], stats['median_ms'], ratio - 1))
+    return regressions, ungated
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the application's hot paths")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5, help="minimum timed rounds per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.5, help="minimum seconds spent timing each benchmark")
+    parser.add_argument('--no-gui', action='store_true', help="skip benchmarks that need a display")
+    parser.add_argument('--output', default=None, help="write results as JSON to this path")
+    parser.add_argument('--baseline', default=None, help="compare medians against this results file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="slowdown fraction reported as a regression")
+    parser.add_argument('--gate-all', action='store_true', help="also fail on slowdowns of benchmarks dominated by disk syncs")
+    parser.add_argument('--save-baseline', default=None, help="write results to this path for later comparison")
+    args = parser.parse_args()
+
+    output_paths = [os.path.abspath(path) if path else None for path in (args.output, args.baseline, args.save_baseline)]
+    selected = [entry for entry in BENCHMARKS if not args.filter or args.filter in entry['name']]
+    if args.no_gui:
+        selected = [entry for entry in selected if not entry['gui']]
+
+    logging.disable(logging.CRITICAL)
+    messagebox.showinfo = messagebox.showerror = lambda *a, **k: 'ok'
+    smtplib.SMTP = SMTPStub
+    xvfb = None
+    if any(entry['gui'] for entry in selected):
+        from headless import start_virtual_display, patch_windows_only_calls
+        xvfb = start_virtual_display()
+        patch_windows_only_calls()
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='benchmarks_') as workdir:
+            os.chdir(workdir)
+            print(f"{'benchmark':<60} {'median ms':>10} {'p95 ms':>10} {'rounds':>7}")
+            for entry in selected:
+                stats = run_benchmark(entry, workdir, args.repeat, args.min_time)
+                results[entry['name']] = stats
+                print(f"{entry['name']:<60} {stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['rounds']:>7}")
+            os.chdir(os.path.dirname(workdir))
+    finally:
+        if xvfb is not None:
+            from headless import stop_virtual_display
+            stop_virtual_display(xvfb)
+
+    output_path, baseline_path, save_baseline_path = output_paths
+    regressions = []
+    if baseline_path:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('platform') != platform.platform():
+            print(f"WARNING baseline was recorded on {baseline.get('platform')}; medians from another machine are not comparable")
+        gated_names = {entry['name'] for entry in BENCHMARKS if entry['gated'] or args.gate_all}
+        regressions, ungated = compare(results, baseline, args.threshold, gated_names)
+        for name, before, after, change in ungated:
+            print(f"changed (not gated) {name}: {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+    document = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    for path in (output_path, save_baseline_path):
+        if path:
+            with open(path, 'w') as result_file:
+                json.dump(document, result_file, indent=2)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from diagnostics import percentile
+
+# Simulates many kiosks pushing audit batches to the collector concurrently and
+# reports the ingest rate and request latency.
+#
+#   python collector_loadgen.py --spawn --kiosks 300 --batches 20
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    length = 0
+    for line in header_lines:
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    body = await reader.readexactly(length)
+    return int(status_line.split(' ')[1]), json.loads(body)
+
+async def request(reader, writer, method, path, body=b'', headers=None):
+    header_text = ''.join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: collector\r\nContent-Length: {len(body)}\r\n{header_text}\r\n".encode() + body)
+    await writer.drain()
+    return await read_response(reader)
+
+def make_submission(station, questions):
+    return {
+        'submission_id': uuid.uuid4().hex,
+        'station': station,
+        'auditor': str(random.randint(100000, 100500)),
+        'team_member': f"TM{random.randint(1000, 9999)}",
+        'submitted_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'comments': "Load generator submission",
+        'responses': [[question_id, random.choice("OOOX")] for question_id in range(1, questions + 1)],
+    }
+
+async def kiosk(host, port, station, batches, batch_size, questions, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(batches):
+            body = gzip.compress(json.dumps([make_submission(station, questions) for _ in range(batch_size)]).encode())
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', '/audits', body,
+                                      {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+async def wait_for_port(host, port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+async def run(args):
+    await wait_for_port(args.host, args.port)
+    latencies = []
+    failures = []
+    started = time.perf_counter()
+    await asyncio.gather(*(kiosk(args.host, args.port, f"KIOSK-{i:04d}", args.batches, args.batch_size, args.questions, latencies, failures)
+                           for i in range(args.kiosks)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, report = await request(reader, writer, 'GET', '/reports?group=station', headers={'Connection': 'close'})
+    writer.close()
+
+    submissions = args.kiosks * args.batches * args.batch_size
+    latencies.sort()
+    print(f"kiosks: {args.kiosks}  requests: {len(latencies)}  failures: {len(failures)}")
+    print(f"submissions: {submissions} in {elapsed:.2f}s = {submissions / elapsed:.0f}/s ({submissions * args.questions / elapsed:.0f} responses/s)")
+    print(f"request latency ms: p50 {percentile(latencies, 0.5):.1f}  p95 {percentile(latencies, 0.95):.1f}  p99 {percentile(latencies, 0.99):.1f}  max {latencies[-1]:.1f}")
+    print(f"stations in collector report: {len(report['rows'])}, audits: {sum(row['audits'] for row in report['rows'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the audit collector")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--kiosks', type=int, default=200)
+    parser.add_argument('--batches', type=int, default=10, help="requests sent by each kiosk")
+    parser.add_argument('--batch-size', type=int, default=5, help="submissions per request")
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--spawn', action='store_true', help="start a collector with a scratch database for the run")
+    args = parser.parse_args()
+
+    server = None
+    scratch = None
+    if args.spawn:
+        scratch = tempfile.mkdtemp(prefix='collector_')
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'collector_service.py'),
+                                   '--host', args.host, '--port', str(args.port), '--db', os.path.join(scratch, 'collector.db')])
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            print(f"collector database: {os.path.join(scratch, 'collector.db')}")
+
+if __name__ == '__main__':
+    main()
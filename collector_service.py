@@ -0,0 +1,268 @@
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+# Plant-wide collector for audit submissions pushed by the kiosks.
+#
+#   POST /audits            gzip (or plain) JSON list of submissions
+#   GET  /reports?group=... aggregated results; group is one of REPORT_GROUPS
+#   GET  /health
+#
+# A submission is {"submission_id", "station", "auditor", "team_member",
+# "submitted_at", "comments", "responses": [[question_id, response], ...]}.
+# Re-sent submissions are ignored, so kiosks can retry freely. Malformed
+# submissions are rejected individually and listed in the response; the rest
+# of the request is still stored.
+
+REPORT_GROUPS = {
+    'station': 's.station',
+    'auditor': 's.auditor',
+    'team_member': 's.team_member',
+    'question': 'r.question_id',
+    'day': 'substr(s.submitted_at, 1, 10)',
+}
+
+def validate_submission(submission):
+    # Returns the submission with only the known fields, or raises ValueError
+    if not isinstance(submission, dict):
+        raise ValueError("submission must be an object")
+    for field in ('submission_id', 'auditor', 'team_member'):
+        if not isinstance(submission.get(field), str) or not submission[field]:
+            raise ValueError(f"{field} is required")
+    for field in ('station', 'submitted_at', 'comments'):
+        if submission.get(field) is not None and not isinstance(submission[field], str):
+            raise ValueError(f"{field} must be a string")
+    responses = submission.get('responses')
+    if not isinstance(responses, list):
+        raise ValueError("responses must be a list")
+    for response in responses:
+        if (not isinstance(response, list) or len(response) != 2 or not isinstance(response[0], int)
+                or isinstance(response[0], bool) or not isinstance(response[1], str)):
+            raise ValueError("responses must be [question_id, response] pairs")
+    return {field: submission.get(field) for field in ('submission_id', 'station', 'auditor', 'team_member', 'submitted_at', 'comments', 'responses')}
+
+
+class CentralStore:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        cursor = self.conn.cursor()
+        cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS submissions (
+            submission_id TEXT PRIMARY KEY,
+            station TEXT NOT NULL,
+            auditor TEXT NOT NULL,
+            team_member TEXT NOT NULL,
+            submitted_at TEXT,
+            comments TEXT,
+            received_at TEXT NOT NULL
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            submission_id TEXT NOT NULL,
+            question_id INTEGER NOT NULL,
+            response TEXT NOT NULL,
+            PRIMARY KEY (submission_id, question_id)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_submissions_submitted_at ON submissions (submitted_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_submissions_station ON submissions (station, submitted_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_submissions_auditor ON submissions (auditor, submitted_at)')
+        self.conn.commit()
+
+    def ingest(self, submissions):
+        # One transaction per batch; returns the number of new response rows
+        received_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self.conn:
+            cursor = self.conn.cursor()
+            before = self.conn.total_changes
+            cursor.executemany(
+                'INSERT OR IGNORE INTO submissions (submission_id, station, auditor, team_member, submitted_at, comments, received_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(s['submission_id'], s.get('station', ''), s['auditor'], s['team_member'], s.get('submitted_at'), s.get('comments'), received_at) for s in submissions])
+            submission_changes = self.conn.total_changes - before
+            # Responses are inserted independently so a submission split across uploads is merged
+            cursor.executemany(
+                'INSERT OR IGNORE INTO responses (submission_id, question_id, response) VALUES (?, ?, ?)',
+                [(s['submission_id'], question_id, response) for s in submissions for question_id, response in s['responses']])
+            return self.conn.total_changes - before - submission_changes
+
+    def report(self, group='station', start=None, end=None):
+        column = REPORT_GROUPS[group]
+        query = (f"SELECT {column}, COUNT(DISTINCT s.submission_id), COUNT(*), SUM(r.response = 'X') "
+                 "FROM submissions s JOIN responses r ON r.submission_id = s.submission_id")
+        conditions = []
+        params = []
+        if start:
+            conditions.append('s.submitted_at >= ?')
+            params.append(start)
+        if end:
+            conditions.append('s.submitted_at <= ?')
+            params.append(f"{end} 23:59:59")
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += f' GROUP BY {column} ORDER BY {column}'
+        rows = self.conn.execute(query, params).fetchall()
+        return [{'key': key, 'audits': audits, 'responses': responses, 'nonconforming': nonconforming or 0}
+                for key, audits, responses, nonconforming in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+class CollectorService:
+    # Requests are acknowledged once their batch is committed. Submissions
+    # that arrive together are written in a single transaction (group commit).
+    def __init__(self, store, batch_size=2000, batch_wait=0.01):
+        self.store = store
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        # A single worker keeps every use of the SQLite connection on one thread
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.server = None
+
+    async def start(self, host, port):
+        self.queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.write_batches())
+        self.server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        logging.info(f"Collector listening on {host}:{port}")
+        return self.server
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.writer_task.cancel()
+        self.executor.shutdown(wait=True)
+
+    async def write_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            count = len(pending[0][0])
+            deadline = loop.time() + self.batch_wait
+            while count < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                count += len(item[0])
+            submissions = [submission for batch, _ in pending for submission in batch]
+            try:
+                await loop.run_in_executor(self.executor, self.store.ingest, submissions)
+                for batch, future in pending:
+                    future.set_result(len(batch))
+            except Exception as e:
+                logging.error(f"Failed to ingest {len(submissions)} submissions: {e}")
+                if len(pending) == 1:
+                    pending[0][1].set_exception(e)
+                    continue
+                # Retry each request on its own so one failure does not fail the others
+                for batch, future in pending:
+                    try:
+                        await loop.run_in_executor(self.executor, self.store.ingest, batch)
+                        future.set_result(len(batch))
+                    except Exception as batch_error:
+                        future.set_exception(batch_error)
+
+    async def ingest(self, submissions):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((submissions, future))
+        return await future
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                method, target, _ = request_line.split(' ', 2)
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self.route(method, target, headers, body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except Exception as e:
+            logging.error(f"Collector connection error: {e}")
+        finally:
+            writer.close()
+
+    async def route(self, method, target, headers, body):
+        url = urlsplit(target)
+        try:
+            if method == 'POST' and url.path == '/audits':
+                if headers.get('content-encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                submissions = json.loads(body)
+                if not isinstance(submissions, list):
+                    raise ValueError("body must be a JSON list of submissions")
+                valid = []
+                rejected = []
+                for index, submission in enumerate(submissions):
+                    try:
+                        valid.append(validate_submission(submission))
+                    except ValueError as e:
+                        submission_id = submission.get('submission_id') if isinstance(submission, dict) else None
+                        rejected.append({'index': index, 'submission_id': submission_id, 'error': str(e)})
+                if rejected:
+                    logging.warning(f"Rejected {len(rejected)} malformed submissions: {rejected[:5]}")
+                accepted = await self.ingest(valid) if valid else 0
+                return '200 OK', {'accepted': accepted, 'rejected': rejected}
+            if method == 'GET' and url.path == '/reports':
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                group = query.get('group', 'station')
+                if group not in REPORT_GROUPS:
+                    return '400 Bad Request', {'error': f"group must be one of {sorted(REPORT_GROUPS)}"}
+                rows = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.store.report, group, query.get('start'), query.get('end'))
+                return '200 OK', {'group': group, 'rows': rows}
+            if method == 'GET' and url.path == '/health':
+                return '200 OK', {'status': 'ok', 'queued': self.queue.qsize()}
+            return '404 Not Found', {'error': 'not found'}
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            return '400 Bad Request', {'error': str(e)}
+        except Exception as e:
+            logging.error(f"Collector request failed: {e}")
+            return '500 Internal Server Error', {'error': str(e)}
+
+async def serve(host, port, db_path):
+    service = CollectorService(CentralStore(db_path))
+    server = await service.start(host, port)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local audit collector service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--db', default='collector.db')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(serve(args.host, args.port, args.db))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
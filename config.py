@@ -7,3 +7,49 @@ BUTTON_WIDTH = 20
 BUTTON_FONT = ('Calibri', 14)
 LABEL_FONT = ('Calibri', 24, 'bold')
 CONFIG_DB_PATH = "config.db"
+NOTIFICATIONS_PAGE_SIZE = 200
+# Players started from this command are tracked, capped at MAX_VIDEO_PLAYERS and
+# reaped. If its executable is missing, videos fall back to the OS file
+# association, which is only debounced; a warning is logged at startup.
+VIDEO_PLAYER_COMMAND = ["C:/Program Files/VideoLAN/VLC/vlc.exe", "{file}"]
+VIDEO_PLAYER_REUSE_COMMAND = None  # e.g. ["C:/Program Files/VideoLAN/VLC/vlc.exe", "--one-instance", "--playlist-enqueue", "{file}"]
+MAX_VIDEO_PLAYERS = 2
+VIDEO_LAUNCH_DEBOUNCE_SECONDS = 2.0
+MEDIA_REAP_INTERVAL_MS = 30000
+PDF_CACHE_MAX_DOCUMENTS = 8
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024
+ARCHIVE_DIR = "archive"
+BACKUP_DIR = "backups"
+BACKUP_KEEP = 7
+AUDIT_RETENTION_MONTHS = 3
+MAINTENANCE_IDLE_SECONDS = 300
+MAINTENANCE_CHECK_INTERVAL_MS = 60000
+MAINTENANCE_INTERVAL_HOURS = 24
+COLLECTOR_URL = None  # e.g. "http://collector.local:8765"; None disables uploads
+STATION_ID = os.environ.get('COMPUTERNAME', 'station')
+UPLOAD_BATCH_ROWS = 1000
+UPLOAD_INTERVAL_SECONDS = 30
+UPLOAD_MAX_BACKOFF_SECONDS = 600
+SMTP_SERVER = "smtp.example.com"
+SMTP_PORT = 587
+SMTP_SENDER = "your_email@example.com"
+SMTP_LOGIN = "your_email@example.com"
+SMTP_PASSWORD = "your_password"
+ERROR_REPORT_RECIPIENT = "admin@example.com"
+REMINDER_LEAD_MINUTES = 15
+REMINDER_WINDOW_HOURS = 24
+REMINDER_BATCH_SIZE = 200
+REMINDER_REFRESH_MS = 10 * 60 * 1000
+EMAIL_REMINDERS = False
+REVISION_DIR = "revisions"
+METRICS_PATH = "metrics.json"
+STALL_LOG_PATH = "stalls.log"
+STALL_LOG_MAX_BYTES = 1024 * 1024
+STALL_LOG_BACKUPS = 5
+STALL_HEARTBEAT_MS = 200
+STALL_THRESHOLD_SECONDS = 1.0
+JOURNAL_PATH = "audit_journal.db"  # local disk, never the shared drive
+JOURNAL_BATCH_SIZE = 50
+JOURNAL_RETRY_INTERVAL_SECONDS = 30
+JOURNAL_MAX_BACKOFF_SECONDS = 300
+JOURNAL_BUSY_TIMEOUT_SECONDS = 5
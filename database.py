@@ -1,5 +1,6 @@
 import sqlite3
 import logging
+from datetime import datetime
 
 CONFIG_DB_PATH = "config.db"
 
@@ -38,6 +39,9 @@ def init_db():
         audit_date TEXT,
         audit_time TEXT,
         description TEXT,
+        due_at INTEGER,
+        recurrence TEXT,
+        reminded_through INTEGER,
         FOREIGN KEY(auditor_id) REFERENCES users(id)
     )
     ''')
@@ -50,13 +54,52 @@ def init_db():
         question_id INTEGER NOT NULL,
         response TEXT NOT NULL,
         comments TEXT,
+        submitted_at TEXT,
+        submission_id TEXT,
+        document_path TEXT,
         FOREIGN KEY (question_id) REFERENCES audit_questions (id)
     )
     ''')
 
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS audit_reminders (
+        schedule_id INTEGER NOT NULL,
+        station TEXT NOT NULL,
+        reminded_through INTEGER NOT NULL,
+        PRIMARY KEY (schedule_id, station)
+    )
+    ''')
+
+    _add_column_if_missing(cursor, 'audit_results', 'submitted_at', 'TEXT')
+    _add_column_if_missing(cursor, 'audit_results', 'submission_id', 'TEXT')
+    _add_column_if_missing(cursor, 'audit_results', 'document_path', 'TEXT')
+    _add_column_if_missing(cursor, 'audit_results', 'station', 'TEXT')
+    _add_column_if_missing(cursor, 'audit_schedule', 'due_at', 'INTEGER')
+    _add_column_if_missing(cursor, 'audit_schedule', 'recurrence', 'TEXT')
+    _add_column_if_missing(cursor, 'audit_schedule', 'reminded_through', 'INTEGER')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_results_submitted_at ON audit_results (submitted_at)')
+    # Journaled submissions are written with INSERT OR IGNORE against this index
+    cursor.execute('DROP INDEX IF EXISTS idx_audit_results_submission_id')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_results_submission_question ON audit_results (submission_id, question_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_results_station ON audit_results (station, id)')
+    # Schedule pages are keyed on the COALESCEd date and time so rows with a
+    # NULL date or time still compare and are not skipped between pages
+    cursor.execute('DROP INDEX IF EXISTS idx_audit_schedule_date_time')
+    cursor.execute('DROP INDEX IF EXISTS idx_audit_schedule_auditor')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_schedule_page ON audit_schedule (COALESCE(audit_date, ''), COALESCE(audit_time, ''), id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_schedule_auditor_page ON audit_schedule (auditor_id, COALESCE(audit_date, ''), COALESCE(audit_time, ''), id)")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_schedule_due_at ON audit_schedule (due_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_schedule_recurring ON audit_schedule (id) WHERE recurrence IS NOT NULL')
+
     conn.commit()
     conn.close()
 
+def _add_column_if_missing(cursor, table, column, definition):
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
 def add_config(key, value):
     try:
         conn = sqlite3.connect(CONFIG_DB_PATH)
@@ -140,17 +183,73 @@ def delete_audit_question(question_id):
     finally:
         conn.close()
 
-def schedule_audit(auditor_id, audit_date, audit_time, description):
+SCHEDULE_TIME_FORMATS = ['%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %I:%M %p', '%Y-%m-%d %I:%M%p', '%m/%d/%Y %H:%M', '%m/%d/%Y %I:%M %p']
+
+def parse_schedule_time(audit_date, audit_time):
+    # Local datetime for the free-form date and time fields, or None
+    text = f"{(audit_date or '').strip()} {(audit_time or '').strip() or '00:00'}"
+    for time_format in SCHEDULE_TIME_FORMATS:
+        try:
+            return datetime.strptime(text, time_format)
+        except ValueError:
+            continue
+    return None
+
+def schedule_due_at(audit_date, audit_time):
+    # Epoch seconds (local time) for the free-form date and time fields, or None
+    parsed = parse_schedule_time(audit_date, audit_time)
+    return int(parsed.timestamp()) if parsed else None
+
+def normalize_schedule_time(audit_date, audit_time):
+    # (YYYY-MM-DD, HH:MM) as stored in audit_schedule, or None when unparseable.
+    # Everything that sorts or filters audit_date as text relies on this form.
+    parsed = parse_schedule_time(audit_date, audit_time)
+    return (parsed.strftime('%Y-%m-%d'), parsed.strftime('%H:%M')) if parsed else None
+
+def schedule_audit(auditor_id, audit_date, audit_time, description, recurrence=None):
+    # Returns the new schedule id, or None on failure
     try:
+        audit_date, audit_time = normalize_schedule_time(audit_date, audit_time) or (audit_date, audit_time)
         conn = sqlite3.connect(CONFIG_DB_PATH)
         cursor = conn.cursor()
-        cursor.execute('INSERT INTO audit_schedule (auditor_id, audit_date, audit_time, description) VALUES (?, ?, ?, ?)',
-                       (auditor_id, audit_date, audit_time, description))
+        cursor.execute('INSERT INTO audit_schedule (auditor_id, audit_date, audit_time, description, due_at, recurrence) VALUES (?, ?, ?, ?, ?, ?)',
+                       (auditor_id, audit_date, audit_time, description, schedule_due_at(audit_date, audit_time), recurrence))
         conn.commit()
+        schedule_id = cursor.lastrowid
         conn.close()
-        send_audit_notification(auditor_id, audit_date, audit_time, description)
+        return schedule_id
     except Exception as e:
         logging.error(f"Failed to schedule audit: {e}")
+        return None
+
+def backfill_schedule_due_times(batch_size=1000):
+    # Fills due_at for rows written before it existed and rewrites their date
+    # and time as YYYY-MM-DD / HH:MM, as is done for rows scheduled before
+    # dates were normalized. Unparseable rows get due_at -1 and keep their
+    # text so they are not examined again. Returns the number of rows updated.
+    try:
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT id, audit_date, audit_time FROM audit_schedule WHERE due_at IS NULL '
+            "OR (due_at >= 0 AND (audit_date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]' "
+            "OR audit_time NOT GLOB '[0-9][0-9]:[0-9][0-9]')) LIMIT ?", (batch_size,))
+        rows = cursor.fetchall()
+        updates = []
+        for schedule_id, audit_date, audit_time in rows:
+            parsed = parse_schedule_time(audit_date, audit_time)
+            if parsed is None:
+                updates.append((-1, audit_date, audit_time, schedule_id))
+            else:
+                updates.append((int(parsed.timestamp()), parsed.strftime('%Y-%m-%d'), parsed.strftime('%H:%M'), schedule_id))
+        cursor.executemany('UPDATE audit_schedule SET due_at = ?, audit_date = ?, audit_time = ? WHERE id = ?', updates)
+        conn.commit()
+        return len(updates)
+    except Exception as e:
+        logging.error(f"Failed to backfill schedule due times: {e}")
+        return 0
+    finally:
+        conn.close()
 
 def get_audit_schedules():
     try:
@@ -163,3 +262,45 @@ def get_audit_schedules():
     except Exception as e:
         logging.error(f"Failed to get audit schedules: {e}")
         return []
+
+def get_audit_schedules_page(after=None, limit=200, auditor_id=None, start_date=None, end_date=None, upcoming_only=False):
+    # Keyset pagination over (audit_date, audit_time, id), with NULL dates and
+    # times sorting as ''; pass the last row of the previous page as `after`
+    # to fetch the next one.
+    try:
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        cursor = conn.cursor()
+        query = (
+            'SELECT s.id, s.audit_date, s.audit_time, s.auditor_id, u.employee_number, u.email, s.description '
+            'FROM audit_schedule s LEFT JOIN users u ON u.id = s.auditor_id'
+        )
+        conditions = []
+        params = []
+        if auditor_id is not None:
+            conditions.append('s.auditor_id = ?')
+            params.append(auditor_id)
+        if upcoming_only:
+            conditions.append("COALESCE(s.audit_date, '') >= date('now', 'localtime')")
+        if start_date:
+            conditions.append("COALESCE(s.audit_date, '') >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("COALESCE(s.audit_date, '') <= ?")
+            params.append(end_date)
+        if after is not None:
+            # The leading >= lets SQLite seek the index; the row value is the exact bound
+            conditions.append("COALESCE(s.audit_date, '') >= ?")
+            conditions.append("(COALESCE(s.audit_date, ''), COALESCE(s.audit_time, ''), s.id) > (?, ?, ?)")
+            params.extend([after[1] or '', after[1] or '', after[2] or '', after[0]])
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += " ORDER BY COALESCE(s.audit_date, ''), COALESCE(s.audit_time, ''), s.id LIMIT ?"
+        params.append(limit)
+        cursor.execute(query, params)
+        schedules = cursor.fetchall()
+        return schedules
+    except Exception as e:
+        logging.error(f"Failed to get audit schedules page: {e}")
+        return []
+    finally:
+        conn.close()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+def current_rss_bytes():
+    # Resident set size of this process, or None where it cannot be read
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def open_handle_count():
+    # Open file descriptors (handles on Windows), or None where unavailable
+    try:
+        import psutil
+        process = psutil.Process()
+        return process.num_handles() if sys.platform == 'win32' else process.num_fds()
+    except ImportError:
+        pass
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+def directory_size_bytes(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
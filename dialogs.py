@@ -0,0 +1,129 @@
+import tkinter as tk
+from tkinter import ttk
+import time
+import logging
+from config import ICON_PATH
+
+class Keypad:
+    # On-screen numeric keypad, built once and re-targeted at whichever entry
+    # has focus.
+    def __init__(self, root, scale_factor_width, scale_factor_height):
+        self.target = None
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.title("On-Screen Keypad")
+        self.window.iconbitmap(ICON_PATH)
+        self.window.geometry(f"{int(300 * scale_factor_width)}x{int(400 * scale_factor_height)}")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        self.window.attributes("-topmost", True)
+
+        keypad_frame = ttk.Frame(self.window)
+        keypad_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+        buttons = [
+            '1', '2', '3',
+            '4', '5', '6',
+            '7', '8', '9',
+            '0', 'Backspace', 'Enter'
+        ]
+        for index, button in enumerate(buttons):
+            ttk.Button(keypad_frame, text=button, command=lambda b=button: self.on_key_press(b), width=10).grid(
+                row=index // 3, column=index % 3, sticky='nsew', padx=5, pady=5)
+        for i in range(3):
+            keypad_frame.grid_columnconfigure(i, weight=1)
+        for i in range(4):
+            keypad_frame.grid_rowconfigure(i, weight=1)
+
+    def show(self, entry):
+        self.target = entry
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        self.target = None
+        self.window.withdraw()
+
+    def on_key_press(self, key):
+        entry = self.target
+        if entry is None or not entry.winfo_exists():
+            return
+        if key == "Backspace":
+            current_text = entry.get()
+            entry.delete(len(current_text) - 1, tk.END)
+        elif key == "Enter":
+            self.hide()
+            entry.tk_focusNext().focus()
+        else:
+            entry.insert(tk.END, key)
+
+
+class LoginDialog:
+    # Employee number / PIN prompt shared by every login. The Login button
+    # calls the callback registered for the purpose the dialog was opened with.
+    def __init__(self, root, keypad, callbacks, label_font, button_font, scale_factor_width, scale_factor_height):
+        self.keypad = keypad
+        self.callbacks = callbacks
+        self.purpose = None
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.title("User Authentication")
+        self.window.iconbitmap(ICON_PATH)
+        self.window.geometry(f"{int(400 * scale_factor_width)}x{int(300 * scale_factor_height)}")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        self.window.attributes("-topmost", True)
+
+        container = ttk.Frame(self.window)
+        container.pack(expand=True, fill='both', padx=10, pady=10)
+
+        ttk.Label(container, text="Employee Number:", font=label_font).pack(pady=10)
+        self.emp_num_entry = ttk.Entry(container, font=button_font)
+        self.emp_num_entry.pack(pady=10)
+        self.emp_num_entry.bind("<FocusIn>", lambda event: self.keypad.show(self.emp_num_entry))
+
+        ttk.Label(container, text="Pin:", font=label_font).pack(pady=10)
+        self.pin_entry = ttk.Entry(container, show='*', font=button_font)
+        self.pin_entry.pack(pady=10)
+        self.pin_entry.bind("<FocusIn>", lambda event: self.keypad.show(self.pin_entry))
+
+        ttk.Button(container, text="Login", command=self.submit, style='Custom.TButton').pack(pady=0)
+
+    def open(self, purpose):
+        self.purpose = purpose
+        self.emp_num_entry.delete(0, tk.END)
+        self.pin_entry.delete(0, tk.END)
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        self.keypad.hide()
+        self.window.withdraw()
+
+    def submit(self):
+        callback = self.callbacks.get(self.purpose)
+        if callback is not None:
+            callback()
+
+
+class DialogManager:
+    def __init__(self, app):
+        self.app = app
+        self.keypad = None
+        self.login = None
+
+    def build(self):
+        if self.login is not None:
+            return
+        started = time.perf_counter()
+        app = self.app
+        self.keypad = Keypad(app.root, app.scale_factor_width, app.scale_factor_height)
+        self.login = LoginDialog(app.root, self.keypad,
+                                 {'config': app.check_credentials, 'audit': app.check_audit_credentials},
+                                 app.label_font, app.button_font, app.scale_factor_width, app.scale_factor_height)
+        logging.info(f"Built dialogs in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def open_login(self, purpose):
+        started = time.perf_counter()
+        self.build()
+        self.login.open(purpose)
+        self.login.window.update_idletasks()
+        logging.info(f"Opened {purpose} login in {(time.perf_counter() - started) * 1000:.1f} ms")
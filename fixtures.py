@@ -0,0 +1,71 @@
+import json
+import os
+import random
+import sqlite3
+import fitz  # PyMuPDF
+from PIL import Image
+import database
+
+# Synthetic data for the soak, simulation and benchmark scripts. Everything is
+# written below the given directory; config.db is created through init_db so
+# the schema matches the application's.
+
+def generate_pdfs(directory, count, pages=3):
+    paths = []
+    for i in range(count):
+        doc = fitz.open()
+        for page_num in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Standardized work sheet {i}, page {page_num + 1}", fontsize=18)
+            page.draw_rect(fitz.Rect(72, 100, 540, 700), color=(0, 0, 0), width=1)
+            for step in range(12):
+                page.insert_text((90, 140 + step * 40), f"Step {step + 1}: element {random.randint(100, 999)}", fontsize=12)
+        path = os.path.join(directory, f"document_{i}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+def generate_image(path, size=(600, 200)):
+    Image.new("RGB", size, (200, 30, 30)).save(path)
+    return path
+
+def build_tabs(paths, tabs=3, groups_per_tab=3):
+    config_tabs = []
+    index = 0
+    for tab_num in range(tabs):
+        groups = []
+        for group_num in range(groups_per_tab):
+            buttons = []
+            for _ in range(max(1, len(paths) // (tabs * groups_per_tab))):
+                buttons.append({"text": f"Process {index + 1}", "path": paths[index % len(paths)]})
+                index += 1
+            groups.append({"label": f"Group {group_num + 1}", "buttons": buttons})
+        config_tabs.append({"label": f"Line {tab_num + 1}", "groups": groups})
+    return config_tabs
+
+def create_config_db(directory, tabs=None, users=50, questions=10, schedules=0):
+    # Returns the path of the new database and the list of (employee_number, pin) pairs
+    db_path = os.path.join(directory, "config.db")
+    previous_path = database.CONFIG_DB_PATH
+    database.CONFIG_DB_PATH = db_path
+    try:
+        database.init_db()
+    finally:
+        database.CONFIG_DB_PATH = previous_path
+
+    credentials = [(str(100000 + i), f"{i % 10000:04d}") for i in range(users)]
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.executemany('INSERT INTO users (employee_number, pin, email) VALUES (?, ?, ?)',
+                       [(emp_num, pin, f"user{emp_num}@example.com") for emp_num, pin in credentials])
+    cursor.executemany('INSERT INTO audit_questions (question) VALUES (?)',
+                       [(f"Is step {i + 1} performed as written?",) for i in range(questions)])
+    cursor.executemany('INSERT INTO audit_schedule (auditor_id, audit_date, audit_time, description) VALUES (?, ?, ?, ?)',
+                       [(random.randint(1, max(1, users)), f"{random.randint(2020, 2030)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                         f"{random.randint(6, 22):02d}:{random.choice(['00', '30'])}", f"Scheduled audit {i}") for i in range(schedules)])
+    if tabs is not None:
+        cursor.execute('REPLACE INTO config (key, value) VALUES (?, ?)', ('tabs', json.dumps(tabs)))
+    conn.commit()
+    conn.close()
+    return db_path, credentials
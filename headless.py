@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+import time
+import tkinter as tk
+
+def start_virtual_display(display=':99'):
+    # Start Xvfb when no display is available. Returns the Xvfb process, or
+    # None if an existing display is used.
+    if os.name == 'nt' or os.environ.get('DISPLAY'):
+        return None
+    if shutil.which('Xvfb') is None:
+        raise RuntimeError("No DISPLAY set and Xvfb is not installed")
+    process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    for _ in range(50):
+        try:
+            tk.Tk().destroy()
+            return process
+        except tk.TclError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Xvfb did not start")
+
+def stop_virtual_display(process):
+    if process is not None:
+        process.terminate()
+        process.wait()
+
+def patch_windows_only_calls():
+    # The kiosk runs on Windows; under X11 the 'zoomed' state and .ico icons
+    # are not supported, so map them to their closest equivalents.
+    if os.name == 'nt':
+        return
+    original_state = tk.Wm.wm_state
+    original_iconbitmap = tk.Wm.wm_iconbitmap
+
+    def wm_state(self, newstate=None):
+        if newstate == 'zoomed':
+            return self.wm_attributes('-zoomed', True)
+        return original_state(self, newstate)
+
+    def wm_iconbitmap(self, bitmap=None, default=None):
+        try:
+            return original_iconbitmap(self, bitmap, default)
+        except tk.TclError:
+            return None
+
+    tk.Wm.wm_state = tk.Wm.state = wm_state
+    tk.Wm.wm_iconbitmap = tk.Wm.iconbitmap = wm_iconbitmap
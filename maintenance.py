@@ -0,0 +1,268 @@
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from datetime import date, datetime
+from database import add_config, get_config
+from config import CONFIG_DB_PATH, ARCHIVE_DIR, BACKUP_DIR, BACKUP_KEEP, AUDIT_RETENTION_MONTHS
+from config import MAINTENANCE_IDLE_SECONDS, MAINTENANCE_CHECK_INTERVAL_MS, MAINTENANCE_INTERVAL_HOURS
+
+# Each archived month lives in its own database, ARCHIVE_DIR/config_YYYY_MM.db,
+# holding the audit_results and audit_schedule rows of that month. The hot
+# config.db keeps only the last AUDIT_RETENTION_MONTHS months.
+ARCHIVED_TABLES = {
+    # table: (rows dated before the cutoff, expression giving the YYYY-MM month of a row)
+    # Rows written before submitted_at existed have it NULL and stay in the hot database.
+    'audit_results': ("submitted_at < :cutoff", "substr(submitted_at, 1, 7)"),
+    # Schedules go by due_at, not the free-form audit_date. Recurring schedules
+    # stay live however old their first occurrence is, as do rows whose date
+    # is not yet backfilled (NULL) or could not be parsed (-1).
+    'audit_schedule': ("due_at >= 0 AND due_at < :cutoff_epoch AND recurrence IS NULL",
+                       "strftime('%Y-%m', due_at, 'unixepoch', 'localtime')"),
+}
+MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+
+def archive_path(month):
+    return os.path.join(ARCHIVE_DIR, f"config_{month.replace('-', '_')}.db")
+
+def retention_cutoff(today=None, retention_months=AUDIT_RETENTION_MONTHS):
+    # First day of the oldest month that stays in the hot database
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - 1 - retention_months
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}-01"
+
+def _columns(cursor, schema, table):
+    cursor.execute(f'PRAGMA {schema}.table_info({table})')
+    return [(row[1], row[2]) for row in cursor.fetchall()]
+
+def _prepare_archive_table(cursor, table):
+    # Archives are created from, and kept in step with, the live table layout
+    main_columns = _columns(cursor, 'main', table)
+    archive_columns = [name for name, _ in _columns(cursor, 'archive', table)]
+    if not archive_columns:
+        definition = ', '.join(f'{name} {column_type}' for name, column_type in main_columns)
+        cursor.execute(f'CREATE TABLE archive.{table} ({definition})')
+    else:
+        for name, column_type in main_columns:
+            if name not in archive_columns:
+                cursor.execute(f'ALTER TABLE archive.{table} ADD COLUMN {name} {column_type}')
+    return [name for name, _ in main_columns]
+
+def archive_closed_periods(cutoff=None):
+    # Moves rows dated before the retention cutoff into their monthly archive.
+    # A month that fails is logged and left for the next run; the others are
+    # still archived. Returns {month: rows moved}.
+    cutoff = cutoff or retention_cutoff()
+    params = {'cutoff': cutoff, 'cutoff_epoch': int(datetime.strptime(cutoff, '%Y-%m-%d').timestamp())}
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    moved = {}
+    conn = sqlite3.connect(CONFIG_DB_PATH, timeout=30)
+    try:
+        cursor = conn.cursor()
+        months = set()
+        for table, (before_cutoff, month_expression) in ARCHIVED_TABLES.items():
+            cursor.execute(f"SELECT DISTINCT {month_expression} FROM {table} WHERE {before_cutoff}", params)
+            for (month,) in cursor.fetchall():
+                if isinstance(month, str) and MONTH_PATTERN.match(month):
+                    months.add(month)
+                else:
+                    logging.warning(f"Not archiving {table} rows with unrecognised month {month!r}")
+
+        for month in sorted(months):
+            attached = False
+            try:
+                cursor.execute('ATTACH DATABASE ? AS archive', (archive_path(month),))
+                attached = True
+                cursor.execute('BEGIN IMMEDIATE')
+                month_moved = 0
+                for table, (before_cutoff, month_expression) in ARCHIVED_TABLES.items():
+                    columns = ', '.join(_prepare_archive_table(cursor, table))
+                    condition = f"{before_cutoff} AND {month_expression} = :month"
+                    cursor.execute(f'INSERT INTO archive.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {condition}', {**params, 'month': month})
+                    cursor.execute(f'DELETE FROM main.{table} WHERE {condition}', {**params, 'month': month})
+                    month_moved += cursor.rowcount
+                conn.commit()
+                moved[month] = month_moved
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                logging.error(f"Failed to archive {month}: {e}")
+            finally:
+                if attached:
+                    cursor.execute('DETACH DATABASE archive')
+        # Per-station reminder state goes with the archived one-off schedules
+        cursor.execute('DELETE FROM audit_reminders WHERE schedule_id NOT IN (SELECT id FROM audit_schedule)')
+        conn.commit()
+        if moved:
+            logging.info(f"Archived closed periods: {moved}")
+        return moved
+    finally:
+        conn.close()
+
+def get_audit_results_between(start_date, end_date):
+    # Audit results submitted between two YYYY-MM-DD dates (inclusive), read
+    # from the hot database plus any monthly archives the range touches.
+    # Rows are returned as dicts keyed by column name.
+    # Both dates are checked up front: the month walk below relies on them
+    start, end = datetime.strptime(start_date, '%Y-%m-%d'), datetime.strptime(end_date, '%Y-%m-%d')
+    end_bound = f"{end_date} 23:59:59"
+    query = 'SELECT {columns} FROM {schema}.audit_results WHERE submitted_at >= ? AND submitted_at <= ? ORDER BY submitted_at, id'
+    conn = sqlite3.connect(CONFIG_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.cursor()
+        columns = ', '.join(name for name, _ in _columns(cursor, 'main', 'audit_results'))
+        results = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            path = archive_path(f"{year:04d}-{month:02d}")
+            if os.path.exists(path):
+                cursor.execute('ATTACH DATABASE ? AS archive', (path,))
+                try:
+                    _prepare_archive_table(cursor, 'audit_results')
+                    cursor.execute(query.format(columns=columns, schema='archive'), (start_date, end_bound))
+                    results.extend(dict(row) for row in cursor.fetchall())
+                finally:
+                    cursor.execute('DETACH DATABASE archive')
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        cursor.execute(query.format(columns=columns, schema='main'), (start_date, end_bound))
+        results.extend(dict(row) for row in cursor.fetchall())
+        return results
+    finally:
+        conn.close()
+
+def optimize_database(vacuum_pages=1000):
+    conn = sqlite3.connect(CONFIG_DB_PATH, timeout=30)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] == 2:
+            cursor.execute(f'PRAGMA incremental_vacuum({int(vacuum_pages)})')
+            cursor.fetchall()
+        else:
+            # The conversion needs a full VACUUM holding the write lock, so it
+            # is never done from the idle pass
+            logging.warning("Database is not in incremental auto-vacuum mode; run 'python maintenance.py --convert-vacuum' in a maintenance window")
+        cursor.execute('PRAGMA analysis_limit = 400')
+        cursor.execute('ANALYZE')
+        cursor.execute('PRAGMA optimize')
+        conn.commit()
+    finally:
+        conn.close()
+
+def convert_to_incremental_vacuum():
+    # One-off step: switching to incremental mode only takes effect after a
+    # full VACUUM, which rewrites the whole file and blocks every other
+    # station's writes until it finishes. Run it with the stations closed.
+    conn = sqlite3.connect(CONFIG_DB_PATH, timeout=30)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] == 2:
+            logging.info("Database is already in incremental auto-vacuum mode")
+            return False
+        logging.info(f"Converting {CONFIG_DB_PATH} to incremental auto-vacuum")
+        started = time.monotonic()
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+        logging.info(f"Converted database to incremental auto-vacuum in {time.monotonic() - started:.1f}s")
+        return True
+    finally:
+        conn.close()
+
+def backup_database(pages=256, pause=0.01):
+    # Online copy through the SQLite backup API. Copying a few pages at a
+    # time lets other connections write between steps.
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    destination = os.path.join(BACKUP_DIR, f"config_{datetime.now():%Y%m%d_%H%M%S}.db")
+    partial = destination + '.partial'
+    source = sqlite3.connect(CONFIG_DB_PATH, timeout=30)
+    target = sqlite3.connect(partial)
+    try:
+        source.backup(target, pages=pages, sleep=pause)
+    finally:
+        target.close()
+        source.close()
+    os.replace(partial, destination)
+
+    backups = sorted(name for name in os.listdir(BACKUP_DIR) if name.startswith('config_') and name.endswith('.db'))
+    for name in backups[:-BACKUP_KEEP] if BACKUP_KEEP > 0 else []:
+        os.remove(os.path.join(BACKUP_DIR, name))
+    logging.info(f"Database backed up to {destination}")
+    return destination
+
+def run_maintenance():
+    for task in (archive_closed_periods, optimize_database, backup_database):
+        try:
+            task()
+        except Exception as e:
+            logging.error(f"Maintenance task {task.__name__} failed: {e}")
+    add_config('maintenance_last_run', datetime.now().isoformat(timespec='seconds'))
+
+
+class MaintenanceScheduler:
+    # Runs run_maintenance on a background thread once the kiosk has been idle
+    # for MAINTENANCE_IDLE_SECONDS and the last run is older than
+    # MAINTENANCE_INTERVAL_HOURS. The last run is read by the worker, not the
+    # Tk thread; a worker that finds nothing due sets when to look again.
+    def __init__(self, root):
+        self.root = root
+        self.last_activity = time.monotonic()
+        self.worker = None
+        self.next_check = 0
+        self.root.bind_all('<Any-KeyPress>', self.note_activity, add='+')
+        self.root.bind_all('<Any-ButtonPress>', self.note_activity, add='+')
+        self.root.after(MAINTENANCE_CHECK_INTERVAL_MS, self.check)
+
+    def note_activity(self, event=None):
+        self.last_activity = time.monotonic()
+
+    def seconds_until_due(self):
+        last_run = get_config('maintenance_last_run')
+        if not last_run:
+            return 0
+        return MAINTENANCE_INTERVAL_HOURS * 3600 - (datetime.now() - datetime.fromisoformat(last_run)).total_seconds()
+
+    def run(self):
+        try:
+            remaining = self.seconds_until_due()
+            if remaining > 0:
+                self.next_check = time.monotonic() + remaining
+                return
+            logging.info("Starting idle database maintenance")
+            run_maintenance()
+        except Exception as e:
+            logging.error(f"Failed to run idle maintenance: {e}")
+
+    def check(self):
+        try:
+            now = time.monotonic()
+            idle = now - self.last_activity >= MAINTENANCE_IDLE_SECONDS
+            running = self.worker is not None and self.worker.is_alive()
+            if idle and not running and now >= self.next_check:
+                self.worker = threading.Thread(target=self.run, name='maintenance', daemon=True)
+                self.worker.start()
+        except Exception as e:
+            logging.error(f"Failed to check maintenance schedule: {e}")
+        finally:
+            self.root.after(MAINTENANCE_CHECK_INTERVAL_MS, self.check)
+
+def main():
+    parser = argparse.ArgumentParser(description="One-off database maintenance steps")
+    parser.add_argument('--convert-vacuum', action='store_true', help="switch config.db to incremental auto-vacuum (full VACUUM; close the stations first)")
+    args = parser.parse_args()
+    if not args.convert_vacuum:
+        parser.print_help()
+        return
+    from logging_config import setup_logging
+    setup_logging()
+    if convert_to_incremental_vacuum():
+        print("Database converted to incremental auto-vacuum")
+    else:
+        print("Database is already in incremental auto-vacuum mode")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import os
+import shutil
+import sys
+import subprocess
+import threading
+import time
+import logging
+
+LAUNCHED = 'launched'
+REUSED = 'reused'
+ALREADY_OPEN = 'already_open'
+DEBOUNCED = 'debounced'
+
+class MediaLauncher:
+    # Tracks the media players started by this station. Command templates are
+    # argument lists in which "{file}" is replaced by the media path, e.g.
+    #   player_command=["C:/Program Files/VideoLAN/VLC/vlc.exe", "{file}"]
+    #   reuse_command=["C:/Program Files/VideoLAN/VLC/vlc.exe", "--one-instance", "--playlist-enqueue", "{file}"]
+    # When reuse_command is set and a player is already running, the file is
+    # handed to that player instead of starting another one. A command whose
+    # executable cannot be found is dropped with a warning. Stopped players are
+    # only asked to exit; reap() collects them and kills any that are still
+    # running after stop_seconds, so nothing here waits on the Tk thread.
+    def __init__(self, player_command=None, reuse_command=None, max_players=2, debounce_seconds=2.0, stop_seconds=2.0):
+        self.player_command = self._available(player_command)
+        self.reuse_command = self._available(reuse_command) if self.player_command else None
+        self.max_players = max(1, max_players)
+        self.debounce_seconds = debounce_seconds
+        self.stop_seconds = stop_seconds
+        self.players = []  # (file_path, Popen) in launch order
+        self.helpers = []  # short-lived reuse_command processes
+        self.stopping = []  # (Popen, kill deadline) for players asked to exit
+        self.last_launch = {}
+        self.lock = threading.Lock()
+
+    def open(self, file_path):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+        key = os.path.normcase(os.path.abspath(file_path))
+        with self.lock:
+            self._reap()
+            now = time.monotonic()
+            last = self.last_launch.get(key)
+            if last is not None and now - last < self.debounce_seconds:
+                logging.info(f"Ignoring repeated launch of {file_path}")
+                return DEBOUNCED
+            self.last_launch[key] = now
+
+            if self.player_command is None:
+                self._open_with_default_app(file_path)
+                return LAUNCHED
+
+            for path, _ in self.players:
+                if path == key:
+                    logging.info(f"Player already running for {file_path}")
+                    return ALREADY_OPEN
+
+            if self.reuse_command and self.players:
+                self.helpers.append(subprocess.Popen(self._build_command(self.reuse_command, file_path)))
+                logging.info(f"Handed {file_path} to running player")
+                return REUSED
+
+            while len(self.players) >= self.max_players:
+                old_path, old_process = self.players.pop(0)
+                logging.info(f"Player limit reached, closing player for {old_path}")
+                self._terminate(old_process)
+
+            process = subprocess.Popen(self._build_command(self.player_command, file_path))
+            self.players.append((key, process))
+            logging.info(f"Started player (pid {process.pid}) for {file_path}")
+            return LAUNCHED
+
+    def reap(self):
+        with self.lock:
+            self._reap()
+
+    def running_count(self):
+        with self.lock:
+            self._reap()
+            return len(self.players)
+
+    def close_all(self):
+        with self.lock:
+            for _, process in self.players:
+                self._terminate(process)
+            self.players = []
+            self._reap()
+
+    def _reap(self):
+        # poll() collects the exit status, so finished children do not linger
+        self.players = [(path, process) for path, process in self.players if process.poll() is None]
+        self.helpers = [process for process in self.helpers if process.poll() is None]
+        now = time.monotonic()
+        stopping = []
+        for process, deadline in self.stopping:
+            if process.poll() is not None:
+                continue
+            if now >= deadline:
+                try:
+                    process.kill()
+                    logging.warning(f"Player (pid {process.pid}) did not exit, killed it")
+                except Exception as e:
+                    logging.error(f"Failed to kill player (pid {process.pid}): {e}")
+                    continue
+            stopping.append((process, deadline))
+        self.stopping = stopping
+        cutoff = time.monotonic() - self.debounce_seconds
+        self.last_launch = {path: stamp for path, stamp in self.last_launch.items() if stamp >= cutoff}
+
+    def _terminate(self, process):
+        try:
+            process.terminate()
+            self.stopping.append((process, time.monotonic() + self.stop_seconds))
+        except Exception as e:
+            logging.error(f"Failed to stop player (pid {process.pid}): {e}")
+
+    def _available(self, command):
+        if not command:
+            return None
+        if os.path.exists(command[0]) or shutil.which(command[0]):
+            return command
+        logging.warning(f"Video player {command[0]} not found; videos open with the default application and are not tracked")
+        return None
+
+    def _build_command(self, template, file_path):
+        command = [part.replace('{file}', file_path) for part in template]
+        if not any('{file}' in part for part in template):
+            command.append(file_path)
+        return command
+
+    def _open_with_default_app(self, file_path):
+        # No player configured: hand off to the OS file association. The
+        # resulting process is not ours to track, only debounced.
+        if hasattr(os, 'startfile'):
+            os.startfile(file_path)
+        else:
+            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+            self.helpers.append(subprocess.Popen([opener, file_path]))
@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from media_launcher import MediaLauncher, LAUNCHED, REUSED, ALREADY_OPEN, DEBOUNCED
+
+# Drives MediaLauncher with a dummy player script standing in for the real
+# player and checks debounce, already-open detection, the player cap, reuse
+# and reaping. Exits non-zero if any check fails.
+#
+#   python media_launcher_check.py
+
+DUMMY_PLAYER = '''
+import signal, sys, time
+if len(sys.argv) > 3 and hasattr(signal, "SIGTERM"):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+with open(sys.argv[1] + ".played", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+time.sleep(float(sys.argv[2]) if len(sys.argv) > 2 else 60)
+'''
+
+def wait_for(launcher, condition, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        launcher.reap()
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Check MediaLauncher against a dummy player")
+    parser.add_argument('--debounce', type=float, default=0.5)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(name, condition):
+        print(f"{'ok  ' if condition else 'FAIL'} {name}")
+        if not condition:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as directory:
+        player = os.path.join(directory, 'dummy_player.py')
+        with open(player, 'w') as script:
+            script.write(DUMMY_PLAYER)
+        videos = []
+        for i in range(4):
+            videos.append(os.path.join(directory, f"video{i}.mp4"))
+            open(videos[-1], 'wb').close()
+
+        launcher = MediaLauncher([sys.executable, player, "{file}"], max_players=2, debounce_seconds=args.debounce)
+        try:
+            check("first open launches a player", launcher.open(videos[0]) == LAUNCHED)
+            check("repeated open is debounced", launcher.open(videos[0]) == DEBOUNCED)
+            time.sleep(args.debounce + 0.1)
+            check("open of a playing file is recognised", launcher.open(videos[0]) == ALREADY_OPEN)
+            check("second file launches a player", launcher.open(videos[1]) == LAUNCHED)
+            first_process = launcher.players[0][1]
+            started = time.monotonic()
+            check("third file launches a player", launcher.open(videos[2]) == LAUNCHED)
+            check("evicting the oldest player does not wait for it", time.monotonic() - started < 0.5)
+            check("player count stays at the cap", launcher.running_count() == 2)
+            check("oldest player was stopped", wait_for(launcher, lambda: first_process.poll() is not None))
+            remaining = [process for _, process in launcher.players]
+            launcher.close_all()
+            check("close_all stops every player", launcher.running_count() == 0)
+            check("stopped players are collected by reap", wait_for(launcher, lambda: not launcher.stopping))
+            check("stopped players have exited", all(process.poll() is not None for process in remaining))
+
+            stubborn = MediaLauncher([sys.executable, player, "{file}", "60", "ignore-term"], max_players=1, debounce_seconds=args.debounce, stop_seconds=0.3)
+            stubborn.open(videos[0])
+            time.sleep(0.5)
+            stubborn_process = stubborn.players[0][1]
+            stubborn.close_all()
+            check("player ignoring terminate is killed by reap", wait_for(stubborn, lambda: stubborn_process.poll() is not None))
+
+            short = MediaLauncher([sys.executable, player, "{file}", "0.2"], max_players=2, debounce_seconds=args.debounce)
+            short.open(videos[3])
+            time.sleep(1.0)
+            check("finished players are reaped", short.running_count() == 0)
+
+            reuse = MediaLauncher([sys.executable, player, "{file}"], [sys.executable, player, "{file}", "0"], max_players=2, debounce_seconds=args.debounce)
+            reuse.open(videos[0])
+            check("second file is handed to the running player", reuse.open(videos[1]) == REUSED)
+            check("reuse does not start another player", reuse.running_count() == 1)
+            for helper in reuse.helpers:
+                helper.wait()
+            check("running player was given the second file", os.path.exists(videos[1] + ".played"))
+            reuse.close_all()
+
+            missing = MediaLauncher([os.path.join(directory, 'no_such_player.exe'), "{file}"])
+            check("missing player falls back to the default application", missing.player_command is None)
+        finally:
+            launcher.close_all()
+
+    print(f"{len(failures)} check(s) failed" if failures else "all checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
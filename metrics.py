@@ -0,0 +1,41 @@
+import json
+import os
+import threading
+import time
+from config import METRICS_PATH
+
+# Process-wide counters and timings. Any thread may record; the snapshot is
+# written to METRICS_PATH so it can be read from outside the kiosk (support
+# staff, the shift simulation) without touching the UI.
+
+_lock = threading.Lock()
+_counters = {}
+_timings = {}
+
+def increment(name, value=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def observe(name, value):
+    with _lock:
+        timing = _timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+        timing['count'] += 1
+        timing['total'] += value
+        timing['max'] = max(timing['max'], value)
+        timing['last'] = value
+
+def snapshot():
+    with _lock:
+        return {
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'pid': os.getpid(),
+            'counters': dict(_counters),
+            'timings': {name: dict(timing) for name, timing in _timings.items()},
+        }
+
+def write_snapshot(path=METRICS_PATH):
+    data = snapshot()
+    with open(path + '.tmp', 'w') as target:
+        json.dump(data, target, indent=2)
+    os.replace(path + '.tmp', path)
+    return data
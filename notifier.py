@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+import logging
+from email_utils import send_email
+from config import CONFIG_DB_PATH, SMTP_SERVER, SMTP_PORT, SMTP_SENDER, SMTP_LOGIN, SMTP_PASSWORD
+
+def get_user_email(user_id):
+    try:
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute('SELECT email FROM users WHERE id = ?', (user_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        logging.error(f"Failed to get user email: {e}")
+        return None
+    finally:
+        conn.close()
+
+def send_in_background(receiver_email, subject, body):
+    # SMTP round trips take seconds; keep them off the Tk thread
+    thread = threading.Thread(target=send_email, name='notifier',
+                              args=(SMTP_SENDER, receiver_email, subject, body, SMTP_SERVER, SMTP_PORT, SMTP_LOGIN, SMTP_PASSWORD),
+                              daemon=True)
+    thread.start()
+    return thread
+
+def send_audit_notification(auditor_id, audit_date, audit_time, description, subject="Audit Scheduled"):
+    receiver_email = get_user_email(auditor_id)
+    if not receiver_email:
+        logging.error(f"No email address for auditor {auditor_id}")
+        return None
+    body = f"Audit scheduled for {audit_date} at {audit_time}.\n\n{description}"
+    return send_in_background(receiver_email, subject, body)
@@ -0,0 +1,182 @@
+import tkinter as tk
+from tkinter import ttk
+from PIL import Image, ImageTk
+from collections import OrderedDict
+import os
+import shutil
+import tempfile
+import logging
+import fitz  # PyMuPDF
+from config import ICON_PATH
+
+def render_page(page):
+    pix = page.get_pixmap()
+    return pix, Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+class DocumentCache:
+    # LRU of open fitz documents keyed by source path and modification stamp.
+    # Each document is opened from a private temp copy so the shared file is
+    # never held open; the copy is removed when the document is evicted.
+    def __init__(self, max_documents=8, max_bytes=200 * 1024 * 1024):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, file_path):
+        stat = os.stat(file_path)
+        key = (os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry['doc']
+
+        self.discard(file_path)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            temp_file_path = os.path.join(temp_dir, os.path.basename(file_path))
+            shutil.copyfile(file_path, temp_file_path)
+            doc = fitz.open(temp_file_path)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        self.entries[key] = {'doc': doc, 'temp_dir': temp_dir, 'size': stat.st_size}
+        self.total_bytes += stat.st_size
+        self._evict()
+        return doc
+
+    def local_path(self, file_path):
+        # The private temp copy behind the cached document for file_path, if any
+        path = os.path.normcase(os.path.abspath(file_path))
+        for key, entry in reversed(self.entries.items()):
+            if key[0] == path:
+                return entry['doc'].name
+        return None
+
+    def discard(self, file_path):
+        path = os.path.normcase(os.path.abspath(file_path))
+        for key in [key for key in self.entries if key[0] == path]:
+            self._close(key)
+
+    def close_all(self):
+        for key in list(self.entries):
+            self._close(key)
+
+    def _evict(self):
+        # The most recently opened document always stays, even if it alone exceeds max_bytes
+        while len(self.entries) > 1 and (len(self.entries) > self.max_documents or self.total_bytes > self.max_bytes):
+            self._close(next(iter(self.entries)))
+
+    def _close(self, key):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry['size']
+        try:
+            entry['doc'].close()
+        except Exception as e:
+            logging.error(f"Failed to close PDF document: {e}")
+        shutil.rmtree(entry['temp_dir'], ignore_errors=True)
+
+
+class PDFViewer:
+    # A single viewer window that is hidden instead of destroyed and has its
+    # contents swapped for each document.
+    def __init__(self, root):
+        self.root = root
+        self.window = None
+        self.photos = []
+        self.page_origins = []
+        self.doc = None
+
+    def show(self, doc, build_side_panel=None, highlights=None):
+        if self.window is None or not self.window.winfo_exists():
+            self._build()
+        self.clear()
+        self.window.title("PDF Viewer")
+
+        y = 10
+        width = 0
+        for page_num in range(len(doc)):
+            page = doc.load_page(page_num)
+            pix, img = render_page(page)
+            photo = ImageTk.PhotoImage(img)
+            self.photos.append(photo)
+            self.canvas.create_image(10, y, image=photo, anchor='nw')
+            self.page_origins.append((10, y, pix.width / page.rect.width if page.rect.width else 1))
+            y += pix.height + 20
+            width = max(width, pix.width + 20)
+        self.canvas.configure(scrollregion=(0, 0, width, y))
+        self.canvas.yview_moveto(0)
+        self.doc = doc
+        if highlights:
+            self.set_highlights(highlights)
+
+        if build_side_panel is not None:
+            self.side_frame.grid()
+            build_side_panel(self.side_frame)
+        else:
+            self.side_frame.grid_remove()
+
+        self.window.deiconify()
+        self.window.state('zoomed')
+        self.window.lift()
+
+    def set_highlights(self, highlights):
+        # highlights maps page index -> [(x0, y0, x1, y1), ...] in PDF points
+        self.canvas.delete('highlight')
+        for page_num, regions in highlights.items():
+            if page_num >= len(self.page_origins):
+                continue
+            left, top, zoom = self.page_origins[page_num]
+            for x0, y0, x1, y1 in regions:
+                self.canvas.create_rectangle(left + x0 * zoom, top + y0 * zoom, left + x1 * zoom, top + y1 * zoom,
+                                             outline='red', width=2, tags='highlight')
+
+    def hide(self):
+        self.clear()
+        if self.window is not None and self.window.winfo_exists():
+            self.window.withdraw()
+
+    def clear(self):
+        if self.window is None or not self.window.winfo_exists():
+            self.photos = []
+            return
+        self.canvas.delete('all')
+        self.page_origins = []
+        self.doc = None
+        for photo in self.photos:
+            try:
+                self.window.tk.call('image', 'delete', str(photo))
+            except tk.TclError:
+                pass
+        self.photos = []
+        for widget in self.side_frame.winfo_children():
+            widget.destroy()
+
+    def _build(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("PDF Viewer")
+        self.window.iconbitmap(ICON_PATH)
+        self.window.attributes("-topmost", True)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        main_frame = ttk.Frame(self.window)
+        main_frame.grid(row=0, column=0, sticky="nsew")
+
+        pdf_frame = ttk.Frame(main_frame)
+        pdf_frame.grid(row=0, column=0, sticky="nsew")
+
+        self.side_frame = ttk.Frame(main_frame)
+        self.side_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
+
+        self.canvas = tk.Canvas(pdf_frame, bg='white')
+        scrollbar = ttk.Scrollbar(pdf_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+
+        self.window.grid_columnconfigure(0, weight=1)
+        self.window.grid_rowconfigure(0, weight=1)
+        main_frame.grid_columnconfigure(0, weight=3)
+        main_frame.grid_columnconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(0, weight=1)
@@ -0,0 +1,63 @@
+import argparse
+import tempfile
+import time
+from diagnostics import current_rss_bytes, open_handle_count
+from fixtures import generate_pdfs
+from pdf_viewer import DocumentCache, render_page
+
+# Opens generated PDFs through the shared viewer and document cache many times
+# and prints RSS and open handles, which should level off once the cache is full.
+# --no-display skips Tk and only renders each page the way the viewer does,
+# for machines without Xvfb.
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test for the reusable PDF viewer")
+    parser.add_argument('--opens', type=int, default=500)
+    parser.add_argument('--documents', type=int, default=20)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--sample-every', type=int, default=50)
+    parser.add_argument('--no-display', action='store_true', help="exercise the cache and page rendering without Tk")
+    args = parser.parse_args()
+
+    xvfb = None
+    root = viewer = None
+    if not args.no_display:
+        import tkinter as tk
+        from headless import start_virtual_display, patch_windows_only_calls
+        from pdf_viewer import PDFViewer
+        xvfb = start_virtual_display()
+        patch_windows_only_calls()
+        root = tk.Tk()
+        root.withdraw()
+        viewer = PDFViewer(root)
+    try:
+        cache = DocumentCache()
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_pdfs(directory, args.documents, args.pages)
+            print(f"{'opens':>6} {'rss_mb':>8} {'handles':>8} {'cached':>7} {'ms/open':>8}")
+            started = time.perf_counter()
+            for i in range(1, args.opens + 1):
+                doc = cache.get(paths[i % len(paths)])
+                if viewer is not None:
+                    viewer.show(doc)
+                    root.update()
+                else:
+                    for page in doc:
+                        render_page(page)
+                if i % args.sample_every == 0:
+                    rss = current_rss_bytes()
+                    elapsed = (time.perf_counter() - started) * 1000 / args.sample_every
+                    print(f"{i:>6} {rss / 1048576 if rss else float('nan'):>8.1f} {open_handle_count() or 0:>8} {len(cache.entries):>7} {elapsed:>8.1f}")
+                    started = time.perf_counter()
+            if viewer is not None:
+                viewer.hide()
+            cache.close_all()
+        if root is not None:
+            root.destroy()
+    finally:
+        if xvfb is not None:
+            from headless import stop_virtual_display
+            stop_virtual_display(xvfb)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import os
+import re
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fitz  # PyMuPDF
+from database import get_audit_questions
+from maintenance import get_audit_results_between
+
+# Exports audits as printable PDFs: the audited standardized-work document
+# followed by a page with the form answers, plus a summary note on its first
+# page. Audits are grouped by source document so each worker opens a document
+# once for a whole chunk of audits.
+
+AUDITS_PER_TASK = 25
+
+def load_audits(start_date, end_date, auditor=None):
+    question_text = dict(get_audit_questions())
+    audits = {}
+    for row in get_audit_results_between(start_date, end_date):
+        if auditor and row['auditor'] != auditor:
+            continue
+        key = row['submission_id'] or f"{row['auditor']}|{row['team_member']}|{row['submitted_at']}"
+        audit = audits.setdefault(key, {
+            'submission_id': key,
+            'auditor': row['auditor'],
+            'team_member': row['team_member'],
+            'submitted_at': row['submitted_at'],
+            'comments': (row['comments'] or '').strip(),
+            'document_path': row.get('document_path'),
+            'responses': [],
+        })
+        audit['responses'].append((question_text.get(row['question_id'], f"Question {row['question_id']}"), row['response']))
+    return list(audits.values())
+
+def build_tasks(audits, output_dir, audits_per_task=AUDITS_PER_TASK):
+    by_document = {}
+    for audit in audits:
+        by_document.setdefault(audit['document_path'], []).append(audit)
+    tasks = []
+    for document_path, document_audits in by_document.items():
+        for start in range(0, len(document_audits), audits_per_task):
+            tasks.append((document_path, document_audits[start:start + audits_per_task], output_dir))
+    return tasks
+
+def output_filename(audit):
+    stamp = (audit['submitted_at'] or 'undated').replace(':', '').replace(' ', '_')
+    name = f"{stamp}_{audit['auditor']}_{audit['team_member']}_{audit['submission_id'][:8]}"
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', name) + '.pdf'
+
+def form_text(audit, document_path):
+    lines = [
+        "Standardized Work Audit",
+        "",
+        f"Document: {document_path or 'not recorded'}",
+        f"Submitted: {audit['submitted_at'] or 'unknown'}",
+        f"Auditor: {audit['auditor']}",
+        f"Team Member: {audit['team_member']}",
+        "",
+    ]
+    lines.extend(f"[{response or ' '}]  {question}" for question, response in audit['responses'])
+    lines.extend(["", "Comments:", audit['comments'] or "(none)"])
+    return "\n".join(lines)
+
+def export_document_audits(document_path, audits, output_dir):
+    # Runs in a worker process. Returns a list of (submission_id, output path or None, error)
+    source = None
+    try:
+        if document_path and os.path.exists(document_path):
+            source = fitz.open(document_path)
+    except Exception as e:
+        logging.error(f"Failed to open {document_path} for export: {e}")
+
+    results = []
+    for audit in audits:
+        try:
+            out = fitz.open()
+            if source is not None:
+                out.insert_pdf(source)
+            width, height = (out[0].rect.width, out[0].rect.height) if len(out) else fitz.paper_size('letter')
+            nonconforming = sum(1 for _, response in audit['responses'] if response == 'X')
+            form_page = out.new_page(width=width, height=height)
+            text = form_text(audit, document_path)
+            if source is None:
+                text += "\n\nSource document was not available at export time."
+            form_page.insert_textbox(fitz.Rect(54, 54, width - 54, height - 54), text, fontsize=11)
+            summary = f"Audited {audit['submitted_at']} by {audit['auditor']}: {nonconforming} of {len(audit['responses'])} items not as written."
+            out[0].add_text_annot(fitz.Point(width - 40, 20), summary)
+            path = os.path.join(output_dir, output_filename(audit))
+            out.save(path, garbage=3, deflate=True)
+            out.close()
+            results.append((audit['submission_id'], path, None))
+        except Exception as e:
+            results.append((audit['submission_id'], None, str(e)))
+    if source is not None:
+        source.close()
+    return results
+
+
+class BatchExporter:
+    # Runs an export on a process pool from a background thread. progress is
+    # called from that thread with (done, total, results_so_far); callers on the
+    # Tk thread should hand it over through a queue polled with after().
+    # audits is a list, or a callable that loads it on the export thread.
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self.thread = None
+        self.cancelled = threading.Event()
+
+    def start(self, audits, output_dir, progress, done):
+        os.makedirs(output_dir, exist_ok=True)
+        self.cancelled.clear()
+        self.thread = threading.Thread(target=self._run, args=(audits, output_dir, progress, done), name='report-export', daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _run(self, audits, output_dir, progress, done):
+        results = []
+        try:
+            if callable(audits):
+                audits = audits()
+            progress(0, len(audits), results)
+            tasks = build_tasks(audits, output_dir)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(export_document_audits, *task) for task in tasks]
+                for future in as_completed(futures):
+                    if self.cancelled.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    results.extend(future.result())
+                    progress(len(results), len(audits), results)
+            logging.info(f"Exported {sum(1 for _, path, _ in results if path)} of {len(audits)} audits to {output_dir}")
+            done(results, None)
+        except Exception as e:
+            logging.error(f"Failed to export audit reports: {e}")
+            done(results, e)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import fitz  # PyMuPDF
+from config import REVISION_DIR
+
+# Keeps the rendered pages of the last seen version of each document so that a
+# replaced document can be compared page by page with its previous revision.
+#
+# revisions/<key>/current.npz   grayscale page_N arrays and downsampled thumb_N
+# revisions/<key>/current.json  path, mtime_ns, size, sha1 and page count
+# revisions/<key>/diff.json     changed regions between the last two revisions
+#
+# Regions are (x0, y0, x1, y1) in PDF points, matching the viewer's 72 dpi render.
+#
+# PyMuPDF is not thread-safe and the viewer renders on the Tk thread, so the
+# app goes through submit_update / submit_replacement, which run every
+# revision job in one worker process, one job at a time.
+
+RENDER_SCALE = 1.0
+THUMB_BLOCK = 8        # thumbnails are THUMB_BLOCK x THUMB_BLOCK block means
+THUMB_THRESHOLD = 1.0  # mean grey-level change that marks a block as changed
+PIXEL_THRESHOLD = 32   # grey-level change that marks a pixel as changed
+CELL = 16              # changed pixels are reported on a CELL x CELL grid
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def render_gray(page, scale=RENDER_SCALE):
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY, alpha=False)
+    # Rows in pix.samples may be padded to pix.stride bytes
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width].copy()
+
+def block_means(pixels, block=THUMB_BLOCK):
+    height, width = pixels.shape[0] // block * block, pixels.shape[1] // block * block
+    return pixels[:height, :width].reshape(height // block, block, width // block, block).mean(axis=(1, 3), dtype=np.float32)
+
+def changed_regions(before, after, scale=RENDER_SCALE):
+    if before.shape != after.shape:
+        height, width = after.shape
+        return [(0, 0, width / scale, height / scale)]
+    mask = np.abs(before.astype(np.int16) - after.astype(np.int16)) > PIXEL_THRESHOLD
+    if not mask.any():
+        return []
+    height, width = mask.shape
+    padded = np.zeros((-(-height // CELL) * CELL, -(-width // CELL) * CELL), dtype=bool)
+    padded[:height, :width] = mask
+    cells = padded.reshape(padded.shape[0] // CELL, CELL, padded.shape[1] // CELL, CELL).any(axis=(1, 3))
+
+    # Horizontal runs of changed cells per row, merged with identical runs in the row above
+    regions = []
+    open_runs = {}
+    for row in range(cells.shape[0]):
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], cells[row].view(np.int8), [0]))))
+        runs = set(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        next_open = {}
+        for run in runs:
+            start_row = open_runs.pop(run, row)
+            next_open[run] = start_row
+        for (start, end), start_row in open_runs.items():
+            regions.append((start, start_row, end, row))
+        open_runs = next_open
+    for (start, end), start_row in open_runs.items():
+        regions.append((start, start_row, end, cells.shape[0]))
+    factor = CELL / scale
+    return [(x0 * factor, y0 * factor, min(x1 * factor, width / scale), min(y1 * factor, height / scale))
+            for x0, y0, x1, y1 in sorted(regions, key=lambda region: (region[1], region[0]))]
+
+def update_revision(root_dir, path, render_path=None):
+    return RevisionStore(root_dir).update(path, render_path)
+
+def record_revision_replacement(root_dir, old_path, new_path):
+    RevisionStore(root_dir).record_replacement(old_path, new_path)
+
+def diff_revisions(previous, current_pages, current_thumbs):
+    # previous is the NpzFile of the older revision; its full-size pages are
+    # only read for pages whose thumbnails differ
+    previous_count = len([name for name in previous.files if name.startswith('page_')])
+    changed = {}
+    for index, (pixels, thumb) in enumerate(zip(current_pages, current_thumbs)):
+        if index >= previous_count:
+            break
+        old_thumb = previous[f'thumb_{index}']
+        if old_thumb.shape == thumb.shape and np.abs(old_thumb - thumb).max() < THUMB_THRESHOLD:
+            continue
+        regions = changed_regions(previous[f'page_{index}'], pixels)
+        if regions:
+            changed[index] = regions
+    return {
+        'changed_pages': changed,
+        'added_pages': list(range(previous_count, len(current_pages))),
+        'removed_pages': list(range(len(current_pages), previous_count)),
+    }
+
+
+class RevisionStore:
+    def __init__(self, root_dir=REVISION_DIR):
+        self.root_dir = root_dir
+        self.executor = None
+
+    def submit_update(self, path, render_path=None):
+        # Returns a Future for update() run in the worker process
+        return self._executor().submit(update_revision, self.root_dir, path, render_path)
+
+    def submit_replacement(self, old_path, new_path):
+        return self._executor().submit(record_revision_replacement, self.root_dir, old_path, new_path)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        return self.executor
+
+    def _dir(self, path):
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode()).hexdigest()[:16]
+        return os.path.join(self.root_dir, key)
+
+    def _load_json(self, path):
+        try:
+            with open(path) as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return None
+
+    def _save_json(self, path, data):
+        with open(path + '.tmp', 'w') as target:
+            json.dump(data, target)
+        os.replace(path + '.tmp', path)
+
+    def latest_diff(self, path):
+        # Changes between the current revision and the one before it, if any.
+        # changed_pages maps page index -> list of regions.
+        directory = self._dir(path)
+        meta = self._load_json(os.path.join(directory, 'current.json'))
+        diff = self._load_json(os.path.join(directory, 'diff.json'))
+        if not meta or not diff or diff.get('to_sha1') != meta.get('sha1'):
+            return None
+        diff['changed_pages'] = {int(index): regions for index, regions in diff['changed_pages'].items()}
+        return diff
+
+    def update(self, path, render_path=None):
+        # Records the document's current revision and returns latest_diff.
+        # Rendering only happens when the file's content actually changed.
+        # render_path is a private copy of path to read instead of the shared
+        # file, e.g. the DocumentCache temp copy; path is used if it is gone.
+        if not render_path or not os.path.exists(render_path):
+            render_path = path
+        directory = self._dir(path)
+        meta_path = os.path.join(directory, 'current.json')
+        meta = self._load_json(meta_path)
+        stat = os.stat(path)
+        if meta and meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return self.latest_diff(path)
+        sha1 = file_sha1(render_path)
+        if meta and meta['sha1'] == sha1:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._save_json(meta_path, meta)
+            return self.latest_diff(path)
+
+        started = time.perf_counter()
+        doc = fitz.open(render_path)
+        try:
+            pages = [render_gray(page) for page in doc]
+        finally:
+            doc.close()
+        thumbs = [block_means(pixels) for pixels in pages]
+        os.makedirs(directory, exist_ok=True)
+        pages_path = os.path.join(directory, 'current.npz')
+
+        if meta and os.path.exists(pages_path):
+            with np.load(pages_path) as previous:
+                diff = diff_revisions(previous, pages, thumbs)
+            diff.update(path=path, from_sha1=meta['sha1'], to_sha1=sha1, computed_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+            self._save_json(os.path.join(directory, 'diff.json'), {**diff, 'changed_pages': {str(k): v for k, v in diff['changed_pages'].items()}})
+
+        arrays = {f'page_{index}': pixels for index, pixels in enumerate(pages)}
+        arrays.update({f'thumb_{index}': thumb for index, thumb in enumerate(thumbs)})
+        np.savez_compressed(pages_path + '.tmp.npz', **arrays)
+        os.replace(pages_path + '.tmp.npz', pages_path)
+        self._save_json(meta_path, {'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': sha1, 'pages': len(pages)})
+        logging.info(f"Recorded revision {sha1[:8]} of {path} ({len(pages)} pages) in {time.perf_counter() - started:.2f}s")
+        return self.latest_diff(path)
+
+    def record_replacement(self, old_path, new_path):
+        # A button now points at a different file: treat the old file's last
+        # revision as the previous revision of the new one
+        old_dir, new_dir = self._dir(old_path), self._dir(new_path)
+        if old_dir == new_dir or os.path.exists(os.path.join(new_dir, 'current.json')):
+            return
+        old_meta = self._load_json(os.path.join(old_dir, 'current.json'))
+        if not old_meta or not os.path.exists(os.path.join(old_dir, 'current.npz')):
+            return
+        os.makedirs(new_dir, exist_ok=True)
+        shutil.copyfile(os.path.join(old_dir, 'current.npz'), os.path.join(new_dir, 'current.npz'))
+        self._save_json(os.path.join(new_dir, 'current.json'), {**old_meta, 'path': new_path, 'mtime_ns': 0, 'size': -1})
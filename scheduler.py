@@ -0,0 +1,194 @@
+import calendar
+import heapq
+import sqlite3
+import time
+import logging
+from datetime import datetime, timedelta
+from database import backfill_schedule_due_times
+from config import CONFIG_DB_PATH, STATION_ID
+
+RECURRENCES = ('daily', 'weekly', 'monthly')
+MAX_TIMER_MS = 60 * 60 * 1000
+
+# reminded_through is this station's, from audit_reminders
+SCHEDULE_COLUMNS = 's.id, s.auditor_id, s.audit_date, s.audit_time, s.description, s.due_at, s.recurrence, r.reminded_through'
+SCHEDULE_FROM = 'audit_schedule s LEFT JOIN audit_reminders r ON r.schedule_id = s.id AND r.station = ?'
+
+def add_months(start, months):
+    index = start.month - 1 + months
+    year, month = start.year + index // 12, index % 12 + 1
+    return start.replace(year=year, month=month, day=min(start.day, calendar.monthrange(year, month)[1]))
+
+def next_occurrence(first_due_at, recurrence, after):
+    # First occurrence of a series strictly after `after`, in epoch seconds.
+    # Steps are taken on local wall-clock time so DST does not shift audits.
+    if first_due_at > after:
+        return first_due_at
+    start = datetime.fromtimestamp(first_due_at)
+    after_time = datetime.fromtimestamp(after)
+    if recurrence in ('daily', 'weekly'):
+        step = timedelta(days=1 if recurrence == 'daily' else 7)
+        candidate = start + step * ((after_time - start) // step)
+        while candidate.timestamp() <= after:
+            candidate += step
+        return int(candidate.timestamp())
+    if recurrence == 'monthly':
+        months = (after_time.year - start.year) * 12 + after_time.month - start.month
+        candidate = add_months(start, months)
+        while candidate.timestamp() <= after:
+            months += 1
+            candidate = add_months(start, months)
+        return int(candidate.timestamp())
+    return None
+
+
+class AuditScheduler:
+    # Keeps the next due audits in a heap ordered by reminder time and fires
+    # on_due(reminders) from a single Tk after() timer armed for the earliest
+    # one. One-off audits are read in due order through the due_at index, a
+    # batch at a time and only up to window_seconds ahead. Recurring audits
+    # stay one row each and only their next occurrence is queued.
+    # Every station shows every reminder: audit_reminders records, per
+    # station, the last occurrence reminded so restarts do not repeat it.
+    # audit_schedule.reminded_through is claimed by the first station to fire
+    # an occurrence, and only that station sends the reminder email.
+    def __init__(self, root, on_due, lead_seconds=900, window_seconds=86400, batch_size=200, refresh_ms=600000, station_id=STATION_ID):
+        self.root = root
+        self.station_id = station_id
+        self.on_due = on_due
+        self.lead_seconds = lead_seconds
+        self.window_seconds = window_seconds
+        self.batch_size = batch_size
+        self.refresh_ms = refresh_ms
+        self.heap = []  # (remind_at, occurrence, schedule_id, recurring)
+        self.queued = set()
+        self.cursor = (0, 0)
+        self.max_id = 0
+        self.timer = None
+
+    def start(self):
+        # Older rows get their due_at filled a chunk at a time between events
+        if backfill_schedule_due_times():
+            self.root.after(10, self.start)
+            return
+        self.cursor = (int(time.time()), 0)
+        self.max_id = self._query('SELECT COALESCE(MAX(id), 0) FROM audit_schedule')[0][0]
+        for row in self._schedules('WHERE s.recurrence IS NOT NULL'):
+            self.consider(row)
+        self.scan()
+        self.arm()
+        self.root.after(self.refresh_ms, self.refresh)
+
+    def add(self, schedule_id):
+        rows = self._schedules('WHERE s.id = ?', (schedule_id,))
+        if rows:
+            self.consider(rows[0])
+            self.arm()
+
+    def consider(self, row):
+        schedule_id, _, _, _, _, due_at, recurrence, reminded_through = row
+        if due_at is None or due_at < 0:
+            return
+        now = int(time.time())
+        if recurrence:
+            occurrence = next_occurrence(due_at, recurrence, max(now, reminded_through or 0))
+            if occurrence is not None:
+                self._push(schedule_id, occurrence, True)
+        elif reminded_through is None and now < due_at <= now + self.window_seconds:
+            self._push(schedule_id, due_at, False)
+
+    def scan(self):
+        # Tops the heap up with the next one-off audits inside the window
+        pending = sum(1 for entry in self.heap if not entry[3])
+        if pending >= self.batch_size:
+            return
+        horizon = int(time.time()) + self.window_seconds
+        rows = self._schedules(
+            'WHERE (s.due_at, s.id) > (?, ?) AND s.due_at <= ? AND s.recurrence IS NULL AND r.reminded_through IS NULL '
+            'ORDER BY s.due_at, s.id LIMIT ?', (self.cursor[0], self.cursor[1], horizon, self.batch_size - pending))
+        for row in rows:
+            self.consider(row)
+        if rows:
+            self.cursor = (rows[-1][5], rows[-1][0])
+
+    def refresh(self):
+        # Picks up schedules added by other stations and moves the window forward
+        try:
+            rows = self._schedules('WHERE s.id > ? ORDER BY s.id', (self.max_id,))
+            for row in rows:
+                self.consider(row)
+            if rows:
+                self.max_id = rows[-1][0]
+            self.scan()
+            self.arm()
+        except Exception as e:
+            logging.error(f"Failed to refresh audit schedule: {e}")
+        finally:
+            self.root.after(self.refresh_ms, self.refresh)
+
+    def arm(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+        if self.heap:
+            delay_ms = int((self.heap[0][0] - time.time()) * 1000)
+            self.timer = self.root.after(min(max(delay_ms, 0), MAX_TIMER_MS), self.fire_due)
+
+    def fire_due(self):
+        self.timer = None
+        reminders = []
+        try:
+            now = time.time()
+            while self.heap and self.heap[0][0] <= now:
+                _, occurrence, schedule_id, recurring = heapq.heappop(self.heap)
+                self.queued.discard((schedule_id, occurrence))
+                rows = self._schedules('WHERE s.id = ?', (schedule_id,))
+                if not rows:
+                    continue
+                row = rows[0]
+                _, _, _, _, _, due_at, recurrence, reminded_through = row
+                # The row may have been edited, or reminded by an earlier run, since it was queued
+                if reminded_through is not None and reminded_through >= occurrence:
+                    continue
+                if bool(recurrence) != recurring or (not recurring and due_at != occurrence):
+                    self.consider(row)
+                    continue
+                self._execute('REPLACE INTO audit_reminders (schedule_id, station, reminded_through) VALUES (?, ?, ?)',
+                              (schedule_id, self.station_id, occurrence))
+                claimed = self._execute('UPDATE audit_schedule SET reminded_through = ? WHERE id = ? AND (reminded_through IS NULL OR reminded_through < ?)',
+                                        (occurrence, schedule_id, occurrence))
+                reminders.append((row, occurrence, claimed > 0))
+                if recurring:
+                    self._push(schedule_id, next_occurrence(due_at, recurrence, occurrence), True)
+            self.scan()
+        except Exception as e:
+            logging.error(f"Failed to process due audits: {e}")
+        finally:
+            self.arm()
+        if reminders:
+            self.on_due(reminders)
+
+    def _push(self, schedule_id, occurrence, recurring):
+        if (schedule_id, occurrence) in self.queued:
+            return
+        self.queued.add((schedule_id, occurrence))
+        heapq.heappush(self.heap, (occurrence - self.lead_seconds, occurrence, schedule_id, recurring))
+
+    def _schedules(self, where, params=()):
+        return self._query(f'SELECT {SCHEDULE_COLUMNS} FROM {SCHEDULE_FROM} {where}', (self.station_id,) + tuple(params))
+
+    def _query(self, query, params=()):
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def _execute(self, query, params=()):
+        conn = sqlite3.connect(CONFIG_DB_PATH)
+        try:
+            rowcount = conn.execute(query, params).rowcount
+            conn.commit()
+            return rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,278 @@
+import argparse
+import json
+import logging
+import os
+import random
+import smtplib
+import tempfile
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from diagnostics import current_rss_bytes, open_handle_count, directory_size_bytes, percentile
+from fixtures import generate_pdfs, generate_image, build_tabs, create_config_db
+from headless import start_virtual_display, stop_virtual_display, patch_windows_only_calls
+
+# Drives FileOpenerApp through a scripted operator/auditor workload against a
+# synthetic config.db and generated PDFs, then reports per-action latency
+# percentiles together with RSS, open handle and temp-directory growth.
+#
+#   python shift_simulation.py --duration 3600 --report shift.json
+
+class SMTPStub:
+    sent = []
+
+    def __init__(self, host='', port=0, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def starttls(self, *args, **kwargs):
+        pass
+
+    def login(self, *args, **kwargs):
+        pass
+
+    def sendmail(self, sender, receivers, message):
+        SMTPStub.sent.append((sender, receivers))
+
+    def quit(self):
+        pass
+
+def iter_widgets(widget):
+    for child in widget.winfo_children():
+        yield child
+        yield from iter_widgets(child)
+
+def find_widget(widget, widget_class, text=None):
+    for child in iter_widgets(widget):
+        if isinstance(child, widget_class) and (text is None or str(child.cget('text')) == text):
+            return child
+    return None
+
+def toplevels(root):
+    return [child for child in root.winfo_children() if isinstance(child, tk.Toplevel)]
+
+class ShiftSimulation:
+    def __init__(self, workdir, documents=30, users=200, questions=10, schedules=5000, seed=None):
+        self.workdir = workdir
+        self.random = random.Random(seed)
+        self.latencies = {}
+        self.samples = []
+        self.errors = []
+        self.opened_externally = 0
+
+        self.temp_root = os.path.join(workdir, 'tmp')
+        os.makedirs(self.temp_root, exist_ok=True)
+        tempfile.tempdir = self.temp_root
+
+        pdf_dir = os.path.join(workdir, 'documents')
+        os.makedirs(pdf_dir, exist_ok=True)
+        self.documents = generate_pdfs(pdf_dir, documents)
+        self.header_image = generate_image(os.path.join(workdir, 'header.png'))
+        _, self.credentials = create_config_db(workdir, build_tabs(self.documents), users, questions, schedules)
+        os.chdir(workdir)
+
+    def install_stubs(self):
+        smtplib.SMTP = SMTPStub
+        messagebox.showinfo = lambda *args, **kwargs: 'ok'
+        messagebox.showwarning = lambda *args, **kwargs: 'ok'
+        messagebox.askyesno = lambda *args, **kwargs: True
+        messagebox.showerror = lambda title, message=None, **kwargs: self.errors.append(message or title)
+        os.startfile = self._record_external_open
+        patch_windows_only_calls()
+
+    def _record_external_open(self, path, *args):
+        self.opened_externally += 1
+
+    def start_app(self):
+        from logging_config import setup_logging
+        import app as app_module
+        setup_logging()
+        app_module.HEADER_IMAGE_PATH = self.header_image
+        self.root = tk.Tk()
+        started = time.perf_counter()
+        self.app = app_module.FileOpenerApp(self.root)
+        self.root.update()
+        self.record('startup', time.perf_counter() - started)
+        self.notebook = find_widget(self.root, ttk.Notebook)
+
+    def record(self, action, seconds):
+        self.latencies.setdefault(action, []).append(seconds * 1000)
+
+    def timed(self, action, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.root.update()
+        self.record(action, time.perf_counter() - started)
+        return result
+
+    def tab_switch(self):
+        tabs = self.notebook.tabs() if self.notebook else ()
+        if tabs:
+            self.timed('tab_switch', self.notebook.select, self.random.choice(tabs))
+
+    def document_open(self):
+        self.timed('document_open', self.app.open_file, self.random.choice(self.documents), 'pdf')
+
+    def audit(self):
+        emp_num, pin = self.random.choice(self.credentials)
+
+        def login():
+            self.app.authenticate_audit_user()
+            self.app.dialogs.login.emp_num_entry.insert(0, emp_num)
+            self.app.dialogs.login.pin_entry.insert(0, pin)
+            self.app.check_audit_credentials()
+
+        self.timed('audit_login', login)
+        if not self.app.audit_mode:
+            return
+        self.timed('audit_open', self.app.open_file, self.random.choice(self.documents), 'pdf')
+
+        form = self.app.pdf_viewer.side_frame
+        for child in iter_widgets(form):
+            if isinstance(child, ttk.Combobox):
+                child.set(self.random.choice(["O", "O", "O", "X"]))
+            elif isinstance(child, ttk.Entry):
+                child.insert(0, f"TM{self.random.randint(1000, 9999)}")
+            elif isinstance(child, tk.Text):
+                child.insert("1.0", "Simulated audit comment")
+        submit_button = find_widget(form, ttk.Button, "Submit Audit")
+        if submit_button is not None:
+            self.timed('audit_submit', submit_button.invoke)
+        self.app.pdf_viewer.hide()
+
+    def question_edit(self):
+        before = set(toplevels(self.root))
+        self.timed('question_manager_open', self.app.create_question_manager)
+        for window in set(toplevels(self.root)) - before:
+            entry = find_widget(window, ttk.Entry)
+            if entry is not None:
+                entry.insert(0, f"Simulated question {self.random.randint(1, 10 ** 6)}")
+                self.timed('question_add', find_widget(window, ttk.Button, "Add Question").invoke)
+            delete_button = find_widget(window, ttk.Button, "Delete")
+            if delete_button is not None and self.random.random() < 0.5:
+                self.timed('question_delete', delete_button.invoke)
+            window.destroy()
+
+    def view_notifications(self):
+        before = set(toplevels(self.root))
+        self.timed('notifications_open', self.app.create_view_notifications_ui)
+        for window in set(toplevels(self.root)) - before:
+            window.destroy()
+
+    def sample(self, elapsed):
+        self.samples.append({
+            'elapsed_s': round(elapsed, 1),
+            'rss_bytes': current_rss_bytes(),
+            'open_handles': open_handle_count(),
+            'temp_bytes': directory_size_bytes(self.temp_root),
+            'temp_entries': len(os.listdir(self.temp_root)),
+        })
+
+    def run(self, duration, think_ms=200, sample_seconds=30):
+        workload = [
+            (self.tab_switch, 40),
+            (self.document_open, 30),
+            (self.audit, 15),
+            (self.question_edit, 5),
+            (self.view_notifications, 10),
+        ]
+        actions = [action for action, _ in workload]
+        weights = [weight for _, weight in workload]
+
+        started = time.monotonic()
+        next_sample = started
+        while True:
+            now = time.monotonic()
+            if now >= next_sample:
+                self.sample(now - started)
+                next_sample = now + sample_seconds
+            if now - started >= duration:
+                break
+            self.random.choices(actions, weights)[0]()
+            idle_until = time.monotonic() + self.random.uniform(0.5, 1.5) * think_ms / 1000
+            while time.monotonic() < idle_until:
+                self.root.update()
+                time.sleep(0.01)
+        self.sample(time.monotonic() - started)
+
+    def report(self):
+        actions = {}
+        for action, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            actions[action] = {
+                'count': len(values),
+                'p50_ms': percentile(values, 0.50),
+                'p95_ms': percentile(values, 0.95),
+                'p99_ms': percentile(values, 0.99),
+                'max_ms': values[-1],
+            }
+        first, last = self.samples[0], self.samples[-1]
+
+        def growth(key):
+            if first[key] is None or last[key] is None:
+                return None
+            return last[key] - first[key]
+
+        return {
+            'actions': actions,
+            'rss_growth_bytes': growth('rss_bytes'),
+            'open_handle_growth': growth('open_handles'),
+            'temp_growth_bytes': growth('temp_bytes'),
+            'temp_entry_growth': growth('temp_entries'),
+            'error_dialogs': len(self.errors),
+            'error_samples': self.errors[:10],
+            'emails_sent': len(SMTPStub.sent),
+            'external_opens': self.opened_externally,
+            'samples': self.samples,
+        }
+
+def print_report(report):
+    print(f"{'action':<24} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for action, stats in report['actions'].items():
+        print(f"{action:<24} {stats['count']:>7} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+    for key in ('rss_growth_bytes', 'open_handle_growth', 'temp_growth_bytes', 'temp_entry_growth', 'error_dialogs', 'emails_sent'):
+        print(f"{key}: {report[key]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless shift simulation for FileOpenerApp")
+    parser.add_argument('--duration', type=float, default=600, help="seconds of simulated workload")
+    parser.add_argument('--think-ms', type=float, default=200, help="mean idle time between actions")
+    parser.add_argument('--sample-seconds', type=float, default=30)
+    parser.add_argument('--documents', type=int, default=30)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--schedules', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workdir', default=None, help="keep fixtures and app.log here instead of a temp directory")
+    parser.add_argument('--report', default=None, help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    report_path = os.path.abspath(args.report) if args.report else None
+    workdir = args.workdir or tempfile.mkdtemp(prefix='shift_simulation_')
+    os.makedirs(workdir, exist_ok=True)
+
+    xvfb = start_virtual_display()
+    try:
+        simulation = ShiftSimulation(os.path.abspath(workdir), args.documents, args.users, args.questions, args.schedules, args.seed)
+        simulation.install_stubs()
+        simulation.start_app()
+        simulation.run(args.duration, args.think_ms, args.sample_seconds)
+        report = simulation.report()
+        simulation.root.destroy()
+    finally:
+        stop_virtual_display(xvfb)
+
+    print_report(report)
+    print(f"workdir: {workdir}")
+    if report_path:
+        with open(report_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    logging.shutdown()
+
+if __name__ == '__main__':
+    main()
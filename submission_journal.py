@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+import time
+import logging
+import metrics
+from config import CONFIG_DB_PATH, JOURNAL_PATH
+
+# Audits are appended to a small local SQLite journal (WAL) on the Tk thread
+# and copied to the shared database by a background writer. Each submission
+# keeps its submission_id as an idempotency key: audit_results has a unique
+# index on (submission_id, question_id) and the writer inserts with
+# INSERT OR IGNORE, so a batch that is retried after a crash or a lost commit
+# is never written twice. Journal rows are only deleted once the shared
+# database has committed them.
+
+RESULT_COLUMNS = ('auditor', 'team_member', 'question_id', 'response', 'comments', 'submitted_at', 'submission_id', 'document_path', 'station')
+
+def open_journal(path):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=FULL')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS pending_submissions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        submission_id TEXT NOT NULL UNIQUE,
+        payload TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT
+    )
+    ''')
+    conn.commit()
+    return conn
+
+
+class SubmissionJournal(threading.Thread):
+    def __init__(self, path=JOURNAL_PATH, db_path=None, batch_size=50, interval=30, max_backoff=300, busy_timeout=5, on_flushed=None):
+        super().__init__(name='submission-journal', daemon=True)
+        self.path = path
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.busy_timeout = busy_timeout
+        self.on_flushed = on_flushed
+        self.conn = open_journal(path)  # used by the thread that created the journal
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def append(self, submission_id, rows):
+        # rows are dicts with RESULT_COLUMNS except submission_id
+        started = time.perf_counter()
+        payload = json.dumps([[row[column] if column != 'submission_id' else submission_id for column in RESULT_COLUMNS] for row in rows])
+        self.conn.execute('INSERT OR IGNORE INTO pending_submissions (submission_id, payload, created_at) VALUES (?, ?, ?)',
+                          (submission_id, payload, time.time()))
+        self.conn.commit()
+        metrics.observe('journal.append_seconds', time.perf_counter() - started)
+        self.wake_event.set()
+
+    def pending_count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM pending_submissions').fetchone()[0]
+
+    def run(self):
+        conn = open_journal(self.path)
+        delay = 0
+        try:
+            while not self.stop_event.is_set():
+                self.wake_event.wait(delay)
+                self.wake_event.clear()
+                if self.stop_event.is_set():
+                    break
+                try:
+                    flushed = self.flush(conn)
+                    delay = 0 if flushed >= self.batch_size else self.interval
+                except Exception as e:
+                    delay = min(max(delay * 2, 1), self.max_backoff)
+                    metrics.increment('journal.flush_failures')
+                    logging.error(f"Failed to write journaled audits, retrying in {delay}s: {e}")
+        finally:
+            conn.close()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def flush(self, conn):
+        # Copies one batch of journaled submissions to the shared database.
+        # Returns the number of submissions written.
+        pending = conn.execute('SELECT id, submission_id, payload, created_at FROM pending_submissions ORDER BY id LIMIT ?',
+                               (self.batch_size,)).fetchall()
+        if not pending:
+            return 0
+        started = time.perf_counter()
+        db = sqlite3.connect(self.db_path or CONFIG_DB_PATH, timeout=self.busy_timeout)
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany(f"INSERT OR IGNORE INTO audit_results ({', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * len(RESULT_COLUMNS))})",
+                           [row for _, _, payload, _ in pending for row in json.loads(payload)])
+            db.commit()
+        except Exception as e:
+            conn.execute(f"UPDATE pending_submissions SET attempts = attempts + 1, last_error = ? WHERE id IN ({', '.join('?' * len(pending))})",
+                         [str(e)] + [entry[0] for entry in pending])
+            conn.commit()
+            raise
+        finally:
+            db.close()
+        conn.execute(f"DELETE FROM pending_submissions WHERE id IN ({', '.join('?' * len(pending))})", [entry[0] for entry in pending])
+        conn.commit()
+        now = time.time()
+        metrics.increment('journal.flushed', len(pending))
+        metrics.observe('journal.flush_seconds', time.perf_counter() - started)
+        metrics.observe('journal.max_age_seconds', max(now - entry[3] for entry in pending))
+        logging.info(f"Wrote {len(pending)} journaled audit(s) to the database")
+        if self.on_flushed:
+            self.on_flushed()
+        return len(pending)
@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+import time
+import traceback
+import logging
+from logging.handlers import RotatingFileHandler
+import metrics
+from config import STALL_LOG_PATH, STALL_LOG_MAX_BYTES, STALL_LOG_BACKUPS
+
+def stall_logger(path=STALL_LOG_PATH, max_bytes=STALL_LOG_MAX_BYTES, backups=STALL_LOG_BACKUPS):
+    logger = logging.getLogger('stalls')
+    if not logger.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def innermost_app_frame(stack):
+    # The deepest frame from this application's own modules, e.g. "app.py:312 display_pdf"
+    for summary in reversed(stack):
+        if os.path.dirname(os.path.abspath(summary.filename)) == APP_DIR:
+            return f"{os.path.basename(summary.filename)}:{summary.lineno} {summary.name}"
+    return "unknown"
+
+
+class StallWatchdog(threading.Thread):
+    # Detects Tk event-loop stalls. The Tk thread bumps a heartbeat from an
+    # after() timer; this thread checks it and, once it is late by more than
+    # threshold_seconds, samples the Tk thread's stack with
+    # sys._current_frames(). Samples are taken every check until the loop
+    # comes back, then the stall's duration and distinct stacks go to the
+    # rotating stall log and to metrics. Must be created on the Tk thread.
+    def __init__(self, root, heartbeat_ms=200, threshold_seconds=1.0, max_samples=5):
+        super().__init__(name='stall-watchdog', daemon=True)
+        self.root = root
+        self.heartbeat_ms = heartbeat_ms
+        self.threshold_seconds = threshold_seconds
+        self.max_samples = max_samples
+        self.tk_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.stop_event = threading.Event()
+        self.logger = stall_logger()
+
+    def start(self):
+        self.last_beat = time.monotonic()
+        self.root.after(self.heartbeat_ms, self.beat)
+        super().start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+        if not self.stop_event.is_set():
+            self.root.after(self.heartbeat_ms, self.beat)
+
+    def run(self):
+        check_seconds = min(self.heartbeat_ms / 1000, self.threshold_seconds / 2)
+        stalled_since = None
+        samples = {}
+        while not self.stop_event.wait(check_seconds):
+            try:
+                last_beat = self.last_beat
+                late = time.monotonic() - last_beat - self.heartbeat_ms / 1000
+                if stalled_since is not None and last_beat != stalled_since:
+                    self.report(last_beat - stalled_since - self.heartbeat_ms / 1000, samples)
+                    stalled_since = None
+                    samples = {}
+                if late > self.threshold_seconds:
+                    if stalled_since is None:
+                        stalled_since = last_beat
+                        metrics.increment('ui.stalls_detected')
+                    self.sample(samples, late, last_beat)
+            except Exception as e:
+                logging.error(f"Stall watchdog check failed: {e}")
+
+    def sample(self, samples, late, last_beat):
+        frame = sys._current_frames().get(self.tk_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        del frame
+        if self.last_beat != last_beat:
+            # The loop came back while the stack was being read
+            return
+        text = ''.join(stack.format())
+        if text in samples:
+            samples[text]['count'] += 1
+            return
+        if len(samples) >= self.max_samples:
+            return
+        samples[text] = {'count': 1, 'first_seen': late, 'where': innermost_app_frame(stack)}
+        if len(samples) == 1:
+            # Logged while still stalled so a hang that never recovers is on record
+            self.logger.warning(f"UI stalled for {late:.2f}s so far in {samples[text]['where']}\n{text}")
+
+    def report(self, duration, samples):
+        where = max(samples.values(), key=lambda sample: sample['count'])['where'] if samples else "unknown"
+        metrics.increment('ui.stalls')
+        metrics.observe('ui.stall_seconds', duration)
+        metrics.increment(f'ui.stalls.{where.split(" ")[-1]}')
+        lines = [f"UI stall of {duration:.2f}s, mostly in {where}"]
+        for text, sample in samples.items():
+            lines.append(f"-- {sample['count']} sample(s) from {sample['first_seen']:.2f}s in {sample['where']}:\n{text}")
+        self.logger.warning("\n".join(lines))
+        logging.warning(f"UI stalled for {duration:.2f}s in {where}")
+        try:
+            metrics.write_snapshot()
+        except OSError as e:
+            logging.error(f"Failed to write metrics snapshot: {e}")